@@ -1,19 +1,61 @@
+import json
 import logging
+import os
 import sys
 
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import ApiCreds, AssetType, BalanceAllowanceParams
+from py_clob_client.exceptions import PolyApiException
 
 import config
+from http_session import install_clob_decoder
 
 log = logging.getLogger(__name__)
 
 CLOB_HOST = config.CLOB_HOST
 CHAIN_ID = config.CHAIN_ID
 
+# Derived API creds are persisted here (mode 0600) so restarts skip re-derivation
+CREDS_CACHE_PATH = config.CACHE_DIR / "creds.json"
+
+
+def _load_cached_creds(address: str | None) -> ApiCreds | None:
+    """Load previously derived creds, only if they belong to `address`."""
+    try:
+        data = json.loads(CREDS_CACHE_PATH.read_text())
+        if not address or data.get("address") != address:
+            return None
+        return ApiCreds(
+            api_key=data["api_key"],
+            api_secret=data["api_secret"],
+            api_passphrase=data["api_passphrase"],
+        )
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_cached_creds(address: str | None, creds: ApiCreds) -> None:
+    """Atomically write derived creds to CREDS_CACHE_PATH with mode 0600."""
+    try:
+        CREDS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp = CREDS_CACHE_PATH.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "address": address,
+                "api_key": creds.api_key,
+                "api_secret": creds.api_secret,
+                "api_passphrase": creds.api_passphrase,
+            }, f)
+        os.replace(tmp, CREDS_CACHE_PATH)
+    except OSError as e:
+        log.warning("Could not cache API creds to %s: %s", CREDS_CACHE_PATH, e)
+
 
 def build_client() -> ClobClient:
     """Build and return an authenticated L2 ClobClient."""
+    if install_clob_decoder():
+        log.debug("CLOB responses decoded with orjson")
     creds = None
     if config.CLOB_API_KEY and config.CLOB_SECRET and config.CLOB_PASSPHRASE:
         creds = ApiCreds(
@@ -36,16 +78,20 @@ def build_client() -> ClobClient:
     )
 
     if creds is None:
-        log.info("No API creds in .env, deriving from private key...")
+        creds = _load_cached_creds(client.get_address())
+        if creds is not None:
+            client.set_api_creds(creds)
+            log.info("Using cached API creds from %s", CREDS_CACHE_PATH)
+
+    if creds is None:
+        log.info("No API creds in .env or cache, deriving from private key...")
         creds = client.create_or_derive_api_creds()
         if creds is None:
             log.error("Failed to derive API credentials")
             sys.exit(1)
         client.set_api_creds(creds)
-        log.info("API creds derived. Add these to your .env to skip derivation:")
-        log.info("  CLOB_API_KEY=%s", creds.api_key)
-        log.info("  CLOB_SECRET=%s", creds.api_secret)
-        log.info("  CLOB_PASSPHRASE=%s", creds.api_passphrase)
+        _save_cached_creds(client.get_address(), creds)
+        log.info("API creds derived and cached at %s", CREDS_CACHE_PATH)
 
     # Refresh CLOB-cached USDC allowance
     try:
@@ -64,12 +110,14 @@ def get_usdc_balance(client: ClobClient) -> float:
         resp = client.get_balance_allowance(
             BalanceAllowanceParams(asset_type=AssetType.COLLATERAL)
         )
-        balance = float(resp.get("balance", 0))
-        # Balance is in raw USDC units (6 decimals)
-        return balance / 1e6
-    except Exception as e:
+    except PolyApiException as e:
         log.warning("Could not fetch USDC balance: %s", e)
         return 0.0
+    if not isinstance(resp, dict) or "balance" not in resp:
+        log.warning("Unexpected USDC balance response: %s", resp)
+        return 0.0
+    # Balance is in raw USDC units (6 decimals)
+    return float(resp["balance"]) / 1e6
 
 
 def refresh_allowances(client: ClobClient, token_ids: list[str]) -> None:
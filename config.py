@@ -1,7 +1,23 @@
 import os
-from dotenv import load_dotenv
+import re
+from pathlib import Path
 
-load_dotenv()
+# Minimal one-shot .env loader (real env vars win; parsed once per process)
+_ENV_FILE = Path(__file__).resolve().parent / ".env"
+if not os.environ.get("PM_ENV_LOADED") and _ENV_FILE.exists():
+    for _line in _ENV_FILE.read_text().splitlines():
+        _line = _line.strip()
+        if not _line or _line.startswith("#") or "=" not in _line:
+            continue
+        _key, _, _value = _line.partition("=")
+        _key = _key.strip().removeprefix("export ").strip()  # shell-style `export KEY=val`
+        _value = _value.strip()
+        if _value[:1] in ("'", '"') and _value[0] in _value[1:]:
+            _value = _value[1:_value.index(_value[0], 1)]  # quoted: '#' is literal
+        else:
+            _value = re.split(r"\s+#", _value, maxsplit=1)[0]  # drop an inline `# comment`
+        os.environ.setdefault(_key, _value)
+    os.environ["PM_ENV_LOADED"] = "1"
 
 # --- Credentials ---
 PRIVATE_KEY = os.getenv("PRIVATE_KEY", "")
@@ -13,17 +29,19 @@ FUNDER_ADDRESS = os.getenv("FUNDER_ADDRESS", "")
 # --- CLOB host ---
 CLOB_HOST = "https://clob.polymarket.com"
 CHAIN_ID = 137  # Polygon mainnet
+# Polygon JSON-RPC for batched on-chain balance reads (ERC-1155 balanceOfBatch)
+POLYGON_RPC_URL = os.getenv("POLYGON_RPC_URL", "https://polygon-rpc.com")
 
 # --- Tickers to quote ---
-TICKERS = []  # auto-builds daily equity "Up or Down" slugs
+TICKERS: tuple[str, ...] = ()  # auto-builds daily equity "Up or Down" slugs
 
 # --- Explicit market slugs ---
 # Each entry: {"slug": "event-slug"} for all incentivized outcomes,
 # or {"slug": "event-slug", "outcome": "Norway"} for a specific outcome.
-MARKETS: list[dict] = [
+MARKETS: tuple[dict, ...] = (
     {"slug": "spx-opens-up-or-down-on-february-13-2026"},
-    #{"slug": "of-views-of-mrbeast-video-day-6", "outcome": "50.0–50.5M"}
-]
+    #{"slug": "of-views-of-mrbeast-video-day-6", "outcome": "50.0–50.5M"},
+)
 
 # --- Quoting parameters ---
 # How much of max_incentive_spread to use (0.8 = 80% of allowed spread from mid)
@@ -49,11 +67,30 @@ STOP_LOSS_PCT = 0.05
 # How often to check midpoint for drift (seconds)
 POLL_INTERVAL_SECONDS = 0.2
 
+# --- Scheduling (Linux) ---
+# Pin the quoting process to this CPU core to cut wake-up jitter (None = don't pin)
+PIN_CPU: int | None = None
+# Niceness increment for the quoting process; negative values need CAP_SYS_NICE/root
+NICE_INCREMENT = 0
+# Worker processes for EIP-712 order signing (0 = sign in the quoting process)
+SIGN_WORKERS = 2
+
 # --- Market filters ---
 # Minimum midpoint to accept a market for two-sided quoting.
 # Markets below this can't place a valid bid (bid = mid - half_spread < 0.01).
 MIN_QUOTABLE_MID = 0.15
 
+# --- Local caches ---
+# Derived API creds and per-day discovery results live here
+CACHE_DIR = Path.home() / ".cache" / "pm-lm-mm-bot"
+# Reuse discovered markets (in-memory + CACHE_DIR file) for this long, same ET day only
+DISCOVERY_CACHE_SECONDS = 3600.0
+
+# --- Position tracking (quoting loop) ---
+POSITION_RECONCILE_SECONDS = 60.0  # re-read every balance over REST at least this often
+POSITION_DIRTY_SECONDS = 5.0       # after a fill on a market, re-read its balances for this long
+
 # --- Inventory dumper ---
-INVENTORY_POLL_SECONDS = 0.5       # how often to check positions
+INVENTORY_POLL_SECONDS = 0.5       # how often to check positions (no WebSocket feed)
+INVENTORY_FALLBACK_POLL_SECONDS = 5.0  # safety-net poll when the fill feed is live
 INVENTORY_MIN_SHARES = 1.0         # ignore dust below this
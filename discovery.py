@@ -1,12 +1,17 @@
 import json
 import logging
-from dataclasses import dataclass
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
+from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import requests
 
 import config
+from http_session import get_json, json_loads
 
 log = logging.getLogger(__name__)
 
@@ -14,7 +19,7 @@ GAMMA_API = "https://gamma-api.polymarket.com"
 ET = ZoneInfo("America/New_York")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Market:
     ticker: str                 # e.g. "AAPL" or "Norway" (groupItemTitle)
     question: str               # full event question
@@ -24,19 +29,48 @@ class Market:
     max_incentive_spread: float # in price units (e.g. 0.055)
     min_incentive_size: float   # minimum shares per side
     tick_size: str              # e.g. "0.001"
-
-
-def _build_slug(ticker: str) -> str:
+    tick_size_f: float = field(init=False)  # float(tick_size), parsed once
+    ticks_per_unit: int = field(init=False) # 1 / tick_size_f; prices are handled as whole ticks
+    half_spread: float = field(init=False)  # max_incentive_spread * SPREAD_PCT
+    tick_lo: int = field(init=False)        # lowest tick >= 0.01 (exit clamp)
+    tick_hi: int = field(init=False)        # highest tick <= 0.99 (exit clamp)
+    yes_label: str = field(init=False)      # "{ticker}/YES" for logs
+    no_label: str = field(init=False)       # "{ticker}/NO" for logs
+
+    def __post_init__(self):
+        object.__setattr__(self, "tick_size_f", float(self.tick_size))
+        tpu = round(1.0 / self.tick_size_f)
+        object.__setattr__(self, "ticks_per_unit", tpu)
+        object.__setattr__(self, "half_spread", self.max_incentive_spread * config.SPREAD_PCT)
+        # round() first so 0.01 * 1000 == 10.000000000000002 doesn't ceil to 11
+        object.__setattr__(self, "tick_lo", math.ceil(round(0.01 * tpu, 9)))
+        object.__setattr__(self, "tick_hi", math.floor(round(0.99 * tpu, 9)))
+        object.__setattr__(self, "yes_label", f"{self.ticker}/YES")
+        object.__setattr__(self, "no_label", f"{self.ticker}/NO")
+
+
+# Discovery cache: slugs change at most once per trading day
+# cache key -> (fetched_at, markets)
+_memo: dict[str, tuple[float, list[Market]]] = {}
+
+
+def _build_slugs(tickers: tuple[str, ...]) -> dict[str, str]:
     """
-    Build the Gamma API event slug for today's daily equity market.
+    Build today's Gamma API event slugs for daily equity markets, keyed by ticker.
     Format: {ticker}-up-or-down-on-{month}-{day}-{year}
     e.g. "coin-up-or-down-on-february-11-2026"
     """
     now = datetime.now(ET)
-    month = now.strftime("%B").lower()
-    day = now.day
-    year = now.year
-    return f"{ticker.lower()}-up-or-down-on-{month}-{day}-{year}"
+    suffix = f"-up-or-down-on-{now.strftime('%B').lower()}-{now.day}-{now.year}"
+    return {ticker: f"{ticker.lower()}{suffix}" for ticker in tickers}
+
+
+def _with_rewards(mkt: dict) -> dict:
+    """Parse reward params once and stash them on the market dict as _max_spread/_min_size."""
+    if "_max_spread" not in mkt:
+        mkt["_max_spread"] = float(mkt.get("rewardsMaxSpread", 0) or 0) / 100.0
+        mkt["_min_size"] = float(mkt.get("rewardsMinSize", 0) or 0)
+    return mkt
 
 
 def _parse_market(mkt: dict, label: str, question: str) -> Market | None:
@@ -50,7 +84,7 @@ def _parse_market(mkt: dict, label: str, question: str) -> Market | None:
 
     if isinstance(clob_token_ids, str):
         try:
-            clob_token_ids = json.loads(clob_token_ids)
+            clob_token_ids = json_loads(clob_token_ids)
         except json.JSONDecodeError:
             log.warning("Could not parse clobTokenIds for %s: %s", label, clob_token_ids)
             return None
@@ -59,9 +93,9 @@ def _parse_market(mkt: dict, label: str, question: str) -> Market | None:
         log.warning("Expected 2 token IDs for %s, got %d", label, len(clob_token_ids))
         return None
 
-    max_spread_cents = float(mkt.get("rewardsMaxSpread", 0) or 0)
-    max_spread = max_spread_cents / 100.0
-    min_size = float(mkt.get("rewardsMinSize", 0) or 0)
+    _with_rewards(mkt)
+    max_spread = mkt["_max_spread"]
+    min_size = mkt["_min_size"]
     tick_size = str(mkt.get("orderPriceMinTickSize", "0.01") or "0.01")
 
     return Market(
@@ -81,28 +115,137 @@ def _fetch_event(slug: str) -> dict | None:
     url = f"{GAMMA_API}/events/slug/{slug}"
     log.info("Fetching %s", url)
     try:
-        resp = requests.get(url, timeout=15)
-        if resp.status_code == 404:
+        return get_json(url)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
             log.warning("No event found for slug: %s", slug)
-            return None
-        resp.raise_for_status()
-        return resp.json()
+        else:
+            log.error("Gamma API request failed for slug %s: %s", slug, e)
+        return None
     except Exception as e:
         log.error("Gamma API request failed for slug %s: %s", slug, e)
         return None
 
 
+def _fetch_events_batch(slugs: list[str]) -> dict[str, dict]:
+    """Fetch many events in one Gamma call (/events with repeated slug params).
+    Returns {slug: event dict}; slugs missing from the response are simply absent."""
+    params = [("slug", s) for s in slugs] + [("limit", len(slugs))]
+    log.info("Fetching %d events in one batch", len(slugs))
+    try:
+        events = get_json(f"{GAMMA_API}/events", params=params)
+    except Exception as e:
+        log.warning("Gamma batch event request failed: %s", e)
+        return {}
+    if not isinstance(events, list):
+        return {}
+    return {e["slug"]: e for e in events if isinstance(e, dict) and e.get("slug") in slugs}
+
+
+def _fetch_events(slugs: list[str]) -> dict[str, dict | None]:
+    """
+    Fetch several events: one batch call first, then concurrent per-slug
+    lookups for anything the batch didn't return. Returns {slug: event or None}.
+    """
+    slugs = list(dict.fromkeys(slugs))  # dedupe, keep order
+    if not slugs:
+        return {}
+    events: dict[str, dict | None] = dict(_fetch_events_batch(slugs))
+    missing = [s for s in slugs if s not in events]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), 16)) as pool:
+            events.update(zip(missing, pool.map(_fetch_event, missing)))
+    return events
+
+
+def _cache_path() -> Path:
+    """One cache file per ET trading day, e.g. ~/.cache/pm-lm-mm-bot/markets-20260213.json"""
+    return config.CACHE_DIR / f"markets-{datetime.now(ET):%Y%m%d}.json"
+
+
+def _cache_key() -> str:
+    """
+    Cache key: ET trading date + configured tickers and market slugs/outcomes +
+    the Market schema, so a config or dataclass change invalidates old files.
+    """
+    today = datetime.now(ET).date().isoformat()
+    tickers = ",".join(config.TICKERS)
+    slugs = ",".join(f"{e['slug']}:{e.get('outcome') or ''}" for e in config.MARKETS)
+    schema = ",".join(f.name for f in fields(Market) if f.init)
+    return f"{today}|{tickers}|{slugs}|{schema}"
+
+
+def _load_disk_cache(key: str) -> tuple[float, list[Market]] | None:
+    """Read cached markets from disk. Returns (fetched_at, markets) or None."""
+    try:
+        data = json_loads(_cache_path().read_bytes())
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != key:
+        return None
+    try:
+        init_fields = [f.name for f in fields(Market) if f.init]
+        return float(data["fetched_at"]), [
+            Market(**{name: m[name] for name in init_fields}) for m in data["markets"]
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_disk_cache(key: str, fetched_at: float, markets: list[Market]) -> None:
+    """Atomically write discovered markets to disk."""
+    payload = json.dumps({
+        "key": key,
+        "fetched_at": fetched_at,
+        "markets": [asdict(m) for m in markets],
+    })
+    path = _cache_path()
+    tmp = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(payload)
+        tmp.replace(path)
+    except OSError as e:
+        log.warning("Could not write discovery cache %s: %s", path, e)
+
+
 def discover_markets() -> list[Market]:
+    """
+    Discover markets, served from an in-memory/on-disk cache when a result for
+    today's config is younger than DISCOVERY_CACHE_SECONDS.
+    """
+    key = _cache_key()
+    now = time.time()
+
+    cached = _memo.get(key) or _load_disk_cache(key)
+    if cached and now - cached[0] < config.DISCOVERY_CACHE_SECONDS:
+        fetched_at, markets = cached
+        _memo[key] = cached
+        log.info("Using cached discovery (%d markets, %.0fs old)", len(markets), now - fetched_at)
+        return list(markets)
+
+    markets = _discover_markets_uncached()
+    if markets:
+        _memo[key] = (now, markets)
+        _save_disk_cache(key, now, markets)
+    return list(markets)
+
+
+def _discover_markets_uncached() -> list[Market]:
     """
     Discover markets from both TICKERS (daily equity) and MARKETS (explicit slugs).
     Returns a Market for each live market found.
     """
     markets: list[Market] = []
 
+    # Fan out all Gamma lookups up front so discovery costs ~1 RTT, not N
+    ticker_slugs = _build_slugs(config.TICKERS)
+    events = _fetch_events(list(ticker_slugs.values())
+                           + [entry["slug"] for entry in config.MARKETS])
+
     # --- Daily equity tickers ---
-    for ticker in config.TICKERS:
-        slug = _build_slug(ticker)
-        event = _fetch_event(slug)
+    for ticker, slug in ticker_slugs.items():
+        event = events.get(slug)
         if not event:
             continue
 
@@ -122,7 +265,7 @@ def discover_markets() -> list[Market]:
         slug = entry["slug"]
         outcome = entry.get("outcome")
 
-        event = _fetch_event(slug)
+        event = events.get(slug)
         if not event:
             continue
 
@@ -145,8 +288,8 @@ def discover_markets() -> list[Market]:
             candidates = event_markets
         else:
             # Multiple markets — only keep incentivized ones
-            candidates = [m for m in event_markets
-                          if float(m.get("rewardsMaxSpread", 0) or 0) > 0]
+            candidates = [m for m in map(_with_rewards, event_markets)
+                          if m["_max_spread"] > 0]
             if not candidates:
                 log.warning("No incentivized markets in event '%s'", question)
                 continue
@@ -0,0 +1,105 @@
+"""
+Shared HTTP plumbing for the Gamma and Data APIs — one keep-alive session
+with retries, gzip and a fixed User-Agent, reused by every module.
+
+(Named http_session rather than http so it doesn't shadow the stdlib package.)
+"""
+import json
+import logging
+from importlib.metadata import PackageNotFoundError, version
+
+import httpx
+import requests
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers import helpers as clob_helpers
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json is fine
+    orjson = None
+    json_loads = json.loads
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+# _clob_request is a copy of this release's private helpers.request (pinned in requirements.txt)
+CLOB_CLIENT_VERSION = "0.34.6"
+
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({
+    "Accept": "application/json",
+    "User-Agent": "pm-lm-mm-bot/1.0",
+    "Accept-Encoding": "gzip",
+})
+
+
+def get_json(url: str, **kwargs):
+    """GET `url` on the shared session and return the parsed JSON body.
+    Raises requests.HTTPError on non-2xx responses."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    resp = SESSION.get(url, **kwargs)
+    resp.raise_for_status()
+    return json_loads(resp.content)
+
+
+def post_json(url: str, payload, **kwargs):
+    """POST `payload` as JSON on the shared session and return the parsed JSON body.
+    Raises requests.HTTPError on non-2xx responses."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    resp = SESSION.post(url, json=payload, **kwargs)
+    resp.raise_for_status()
+    return json_loads(resp.content)
+
+
+def _clob_request(endpoint: str, method: str, headers=None, data=None):
+    """Drop-in for py_clob_client's helpers.request that decodes with json_loads.
+    Same semantics: non-200 raises PolyApiException, non-JSON bodies return text."""
+    try:
+        headers = clob_helpers.overloadHeaders(method, headers)
+        if isinstance(data, str):
+            resp = clob_helpers._http_client.request(
+                method=method, url=endpoint, headers=headers, content=data.encode("utf-8"),
+            )
+        else:
+            resp = clob_helpers._http_client.request(
+                method=method, url=endpoint, headers=headers, json=data,
+            )
+        if resp.status_code != 200:
+            raise PolyApiException(resp)
+        try:
+            return json_loads(resp.content)
+        except ValueError:  # orjson.JSONDecodeError subclasses ValueError too
+            return resp.text
+    except httpx.RequestError:
+        raise PolyApiException(error_msg="Request exception!")
+
+
+def install_clob_decoder() -> bool:
+    """Route every ClobClient REST response through orjson. No-op without orjson, or
+    when the installed py_clob_client isn't the release _clob_request was copied from."""
+    if orjson is None:
+        return False
+    try:
+        installed = version("py-clob-client")
+    except PackageNotFoundError:
+        installed = None
+    missing = [name for name in ("request", "overloadHeaders", "_http_client")
+               if not hasattr(clob_helpers, name)]
+    if installed != CLOB_CLIENT_VERSION or missing:
+        log.warning("py-clob-client %s installed but the orjson decoder mirrors %s%s; "
+                    "keeping its stock JSON decoding",
+                    installed, CLOB_CLIENT_VERSION,
+                    f" (missing {', '.join(missing)})" if missing else "")
+        return False
+    clob_helpers.request = _clob_request
+    return True
@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 """
-Inventory Dumper — standalone script that periodically checks for filled
-token positions and dumps them at market price via FOK/FAK orders.
+Inventory Dumper — standalone script that checks for filled token positions
+(on user-channel fill events, plus a slow fallback poll) and dumps them at
+market price via FOK/FAK orders.
 
 Run alongside (or instead of) the main quoting bot:
     .venv/bin/python3 inventory.py
 """
+import atexit
 import logging
-import math
+import os
 import signal
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from eth_abi import decode, encode
+from eth_utils import to_checksum_address
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import (
     AssetType,
@@ -20,96 +25,235 @@ from py_clob_client.clob_types import (
     MarketOrderArgs,
     OrderType,
 )
+from py_clob_client.exceptions import PolyApiException
 
 import config
 from client import build_client
-from discovery import Market, discover_markets
+from discovery import discover_markets
+from http_session import get_json, post_json
+from user_feed import UserFeed
 
 log = logging.getLogger(__name__)
 
+DATA_API = "https://data-api.polymarket.com"
 SIDE_SELL = "SELL"
-COOLDOWN_SECONDS = 3  # skip token after successful sell while balance settles
+COOLDOWN_NS = 3_000_000_000  # skip token for 3s after a successful sell while balance settles
+BALANCE_CACHE_SECONDS = 0.25  # collapse bursts of balance reads for one token
+MICRO = 1_000_000  # conditional tokens use the same 6-decimal raw encoding as USDC
+CTF_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"  # Conditional Tokens (ERC-1155)
+BALANCE_OF_BATCH = "0x4e1273f4"  # balanceOfBatch(address[],uint256[]) selector
+POSITIONS_PAGE_SIZE = 500  # Data API /positions maximum `limit`
 
-# token_id -> timestamp of last successful sell
-_last_sold: dict[str, float] = {}
+# token_id -> time.monotonic_ns() until which the token is skipped
+_cooldown_until: dict[str, int] = {}
+# token_id -> (fetched_at, raw micro-shares); read from worker threads, hence the lock
+_balances: dict[str, tuple[float, int]] = {}
+_balances_lock = threading.Lock()
+# set by SIGINT; the poll loop exits as soon as it's set
+_stop = threading.Event()
 
+# Fixed-size pool shared by every poll, sized to the I/O budget rather than token count
+_POOL = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4),
+                           thread_name_prefix="inv")
+atexit.register(_POOL.shutdown, wait=False)
+
+
+def get_token_balance_raw(client: ClobClient, token_id: str) -> int:
+    """Get the raw conditional token balance (integer micro-shares) for a given token.
+    Reads within BALANCE_CACHE_SECONDS of the last fetch are served from cache."""
+    now = time.time()
+    with _balances_lock:
+        cached = _balances.get(token_id)
+    if cached and now - cached[0] < BALANCE_CACHE_SECONDS:
+        return cached[1]
 
-def get_token_balance(client: ClobClient, token_id: str) -> float:
-    """Get the conditional token balance (in shares) for a given token."""
     resp = client.get_balance_allowance(
         BalanceAllowanceParams(asset_type=AssetType.CONDITIONAL, token_id=token_id)
     )
-    balance = float(resp.get("balance", 0))
-    # Conditional tokens use the same 6-decimal raw encoding as USDC
-    return balance / 1e6
+    raw = int(resp.get("balance", 0) or 0)
+    with _balances_lock:
+        _balances[token_id] = (now, raw)
+    return raw
+
+
+def get_token_balance(client: ClobClient, token_id: str) -> float:
+    """Get the conditional token balance (in shares) for a given token."""
+    return get_token_balance_raw(client, token_id) / MICRO
+
+
+def get_token_balances_batch(owner: str, token_ids: list[str]) -> dict[str, float]:
+    """Read many conditional token balances (in shares) in one on-chain balanceOfBatch call.
+    Raises on RPC or decode failure; callers fall back to get_token_balance per token."""
+    data = BALANCE_OF_BATCH + encode(
+        ["address[]", "uint256[]"],
+        [[to_checksum_address(owner)] * len(token_ids), [int(t) for t in token_ids]],
+    ).hex()
+    resp = post_json(config.POLYGON_RPC_URL, {
+        "jsonrpc": "2.0", "id": 1, "method": "eth_call",
+        "params": [{"to": CTF_ADDRESS, "data": data}, "latest"],
+    })
+    if "result" not in resp:
+        raise RuntimeError(f"balanceOfBatch failed: {resp.get('error')}")
+    (raws,) = decode(["uint256[]"], bytes.fromhex(resp["result"][2:]))
+    if len(raws) != len(token_ids):
+        raise RuntimeError(f"balanceOfBatch returned {len(raws)} of {len(token_ids)} balances")
+    now = time.time()
+    with _balances_lock:
+        for token_id, raw in zip(token_ids, raws):
+            _balances[token_id] = (now, raw)
+    return {token_id: raw / MICRO for token_id, raw in zip(token_ids, raws)}
+
+
+def invalidate_balance(token_id: str) -> None:
+    """Drop a cached balance so the next read hits the API (e.g. after a sell)."""
+    with _balances_lock:
+        _balances.pop(token_id, None)
+
+
+def fetch_all_positions(user: str) -> dict[str, int] | None:
+    """
+    Fetch every conditional token position held by `user` from the Data API,
+    paging with `offset` until a short page comes back.
+    Returns {token_id: raw micro-shares}, or None if any request failed.
+    """
+    positions: dict[str, int] = {}
+    offset = 0
+    try:
+        while True:
+            page = get_json(
+                f"{DATA_API}/positions",
+                params={"user": user, "sizeThreshold": config.INVENTORY_MIN_SHARES,
+                        "limit": POSITIONS_PAGE_SIZE, "offset": offset},
+            )
+            before = len(positions)
+            positions.update(
+                (p["asset"], round(float(p.get("size", 0) or 0) * MICRO)) for p in page)
+            if len(page) < POSITIONS_PAGE_SIZE:
+                return positions
+            if len(positions) == before:
+                # A full page of nothing new: paging isn't advancing, so a missing
+                # token can't be trusted to mean a zero balance
+                raise RuntimeError(f"positions paging stalled at offset {offset}")
+            offset += len(page)
+    except Exception as e:
+        log.warning("Positions fetch failed, falling back to per-token balances: %s", e)
+        return None
+
+
+def _fetch_balances(
+    client: ClobClient, to_check: list[tuple[str, str]],
+) -> dict[tuple[str, str], int]:
+    """Per-token raw balance fetch in parallel (fallback when the positions call fails)."""
+    balances: dict[tuple[str, str], int] = {}
+    futures = {
+        _POOL.submit(get_token_balance_raw, client, token_id): (label, token_id)
+        for label, token_id in to_check
+    }
+    for future in as_completed(futures):
+        label, token_id = futures[future]
+        try:
+            balances[(label, token_id)] = future.result()
+        except Exception as e:
+            log.error("%s balance check failed: %s", label, e)
+    return balances
 
 
 def dump_position(client: ClobClient, token_id: str, shares: float, label: str) -> bool:
     """
     Try to sell `shares` of a conditional token via a market order.
     Attempts FOK first (all-or-nothing); falls back to FAK (partial fill).
+    create_market_order prices against the live book, so a FOK the bids can't
+    fill fails locally ("no match") before anything is posted.
     Returns True if the order was posted successfully.
     """
-    for order_type in (OrderType.FOK, OrderType.FAK):
+    order_types = (OrderType.FOK, OrderType.FAK)
+    # Signed once and reused for the FAK retry; only re-signed if signing itself
+    # failed (e.g. FOK pricing found too little depth — FAK pricing allows partials)
+    order = None
+    for order_type in order_types:
         try:
-            order = client.create_market_order(
-                MarketOrderArgs(
-                    token_id=token_id,
-                    amount=shares,
-                    side=SIDE_SELL,
+            if order is None:
+                order = client.create_market_order(
+                    MarketOrderArgs(
+                        token_id=token_id,
+                        amount=shares,
+                        side=SIDE_SELL,
+                        order_type=order_type,
+                    )
                 )
-            )
             resp = client.post_order(order, orderType=order_type)
-            order_id = resp.get("orderID") or resp.get("id")
-            log.info(
-                "%s SELL %.2f shares (%s) -> order %s",
-                label, shares, order_type, order_id,
-            )
-            return True
+        except PolyApiException as e:
+            if e.status_code in (401, 403):
+                log.error("%s SELL %.2f rejected (auth), not retrying: %s", label, shares, e)
+                return False
+            if e.status_code == 429:
+                log.warning("%s SELL %.2f (%s) rate limited, backing off", label, shares, order_type)
+                time.sleep(0.5)
+                continue
+            if order_type == OrderType.FOK and "fill" in str(e.error_msg).lower():
+                log.info("%s FOK not fillable, trying FAK", label)
+                continue
+            log.warning("%s SELL %.2f (%s) failed: %s", label, shares, order_type, e)
+            return False
         except Exception as e:
+            if order_type == OrderType.FOK and "no match" in str(e):
+                log.info("%s bids can't fill %.2f FOK, trying FAK", label, shares)
+                continue
+            # Other local failures (e.g. no order book); FAK re-signs from scratch
             log.warning("%s SELL %.2f (%s) failed: %s", label, shares, order_type, e)
+            continue
+
+        order_id = resp.get("orderID") or resp.get("id")
+        log.info(
+            "%s SELL %.2f shares (%s) -> order %s",
+            label, shares, order_type, order_id,
+        )
+        return True
 
     return False
 
 
-def check_and_dump(client: ClobClient, markets: list[Market]) -> None:
-    """Check all token positions in parallel and dump any above the threshold."""
+def check_and_dump(
+    client: ClobClient,
+    targets: list[tuple[str, str]],
+    fresh: bool = False,
+) -> None:
+    """
+    Check token positions and dump any above the threshold.
+    `fresh` skips the (slightly lagging) positions API and reads CLOB balances
+    directly — used right after a fill event.
+    """
     # 1. Collect tokens to check (skip cooldowns)
-    to_check: list[tuple[str, str]] = []
-    for market in markets:
-        for side, token_id in [("YES", market.yes_token_id), ("NO", market.no_token_id)]:
-            if time.time() - _last_sold.get(token_id, 0) < COOLDOWN_SECONDS:
-                continue
-            to_check.append((f"{market.ticker}/{side}", token_id))
+    now = time.monotonic_ns()
+    to_check = [(label, token_id) for label, token_id in targets
+                if _cooldown_until.get(token_id, 0) <= now]
 
     if not to_check:
         return
 
-    # 2. Parallel balance fetch
-    balances: dict[tuple[str, str], float] = {}
-    with ThreadPoolExecutor(max_workers=len(to_check)) as pool:
-        futures = {
-            pool.submit(get_token_balance, client, token_id): (label, token_id)
-            for label, token_id in to_check
-        }
-        for future in as_completed(futures):
-            label, token_id = futures[future]
-            try:
-                balances[(label, token_id)] = future.result()
-            except Exception as e:
-                log.error("%s balance check failed: %s", label, e)
-
-    # 3. Dump any positions found
-    for (label, token_id), balance in balances.items():
-        if balance < config.INVENTORY_MIN_SHARES:
+    # 2. One batched positions call; per-token balances only if that fails
+    positions: dict[str, int] | None = None if fresh else fetch_all_positions(
+        config.FUNDER_ADDRESS or client.get_address())
+    balances: dict[tuple[str, str], int]
+    if positions is not None:
+        balances = {(label, token_id): positions.get(token_id, 0)
+                    for label, token_id in to_check}
+    else:
+        balances = _fetch_balances(client, to_check)
+
+    # 3. Dump any positions found (integer math on micro-shares, truncated to cents)
+    min_raw = int(config.INVENTORY_MIN_SHARES * MICRO)
+    for (label, token_id), raw in balances.items():
+        if raw < min_raw:
             continue
-        shares = math.floor(balance * 100) / 100
-        log.info("%s balance=%.4f — dumping %.2f", label, balance, shares)
+        shares = (raw // 10_000) / 100
+        log.info("%s balance=%.4f — dumping %.2f", label, raw / MICRO, shares)
         if dump_position(client, token_id, shares, label):
-            _last_sold[token_id] = time.time()
+            _cooldown_until[token_id] = time.monotonic_ns() + COOLDOWN_NS
+            invalidate_balance(token_id)
 
 
-def main():
+def main() -> None:
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
@@ -130,22 +274,56 @@ def main():
         sys.exit(1)
     log.info("Found %d markets, monitoring inventory every %.1fs",
              len(markets), config.INVENTORY_POLL_SECONDS)
+    targets_by_market = {
+        m.condition_id: [(m.yes_label, m.yes_token_id), (m.no_label, m.no_token_id)]
+        for m in markets
+    }
+    targets = [t for pair in targets_by_market.values() for t in pair]
+
+    # 3. Fill events from the user WebSocket wake the loop; polling is the safety net
+    wake = threading.Event()
+    filled: set[str] = set()
+    filled_lock = threading.Lock()
+
+    def on_trade(condition_id: str) -> None:
+        if condition_id in targets_by_market:
+            with filled_lock:
+                filled.add(condition_id)
+            wake.set()
 
-    # Graceful shutdown
-    running = True
+    feed = None
+    poll_seconds = config.INVENTORY_POLL_SECONDS
+    if UserFeed.available():
+        feed = UserFeed(client.creds, list(targets_by_market), on_trade)
+        feed.start()
+        poll_seconds = config.INVENTORY_FALLBACK_POLL_SECONDS
+    else:
+        log.warning("websocket-client not installed, polling every %.1fs", poll_seconds)
 
-    def handle_sigint(sig, frame):
-        nonlocal running
+    # Graceful shutdown: the handler only flips events, the loop exits immediately
+    def handle_sigint(sig: int, frame: object) -> None:
         log.info("SIGINT received, stopping...")
-        running = False
+        _stop.set()
+        wake.set()
 
     signal.signal(signal.SIGINT, handle_sigint)
 
-    # 3. Poll loop
-    while running:
-        check_and_dump(client, markets)
-        time.sleep(config.INVENTORY_POLL_SECONDS)
+    # 4. Event/poll loop
+    while not _stop.is_set():
+        woke = wake.wait(poll_seconds)
+        wake.clear()
+        if _stop.is_set():
+            break
+        if woke:
+            with filled_lock:
+                hit = [t for cid in filled for t in targets_by_market[cid]]
+                filled.clear()
+            check_and_dump(client, hit, fresh=True)
+        else:
+            check_and_dump(client, targets)
 
+    if feed:
+        feed.stop()
     log.info("Inventory dumper stopped.")
 
 
@@ -6,23 +6,64 @@ Discovers daily equity "Up or Down" markets, places two-sided quotes
 within the reward incentive spread, and refreshes when the midpoint drifts.
 """
 import logging
+import os
 import signal
 import sys
+import threading
 import time
 
 import config
+import signing
 from client import build_client, get_usdc_balance, refresh_allowances
 from discovery import discover_markets
+from market_feed import MidpointCache
+from positions import PositionTracker
 from quoting import (
+    CyclePlan,
     QuotedMarket,
+    apply_cycle_plans,
     cancel_all_quoted,
     fetch_market_data,
+    get_midpoints,
     place_quotes,
-    process_market_cycle,
+    plan_market_cycle,
 )
 
 log = logging.getLogger(__name__)
 
+# Set by SIGINT; the monitor loop does the cancel on the normal request path
+_stop = threading.Event()
+
+
+def _handle_sigint(sig, frame) -> None:
+    """Only flag shutdown here — no network I/O inside a signal handler."""
+    log.info("SIGINT received, shutting down after the current step...")
+    _stop.set()
+
+
+def tune_scheduling() -> None:
+    """Apply PIN_CPU / NICE_INCREMENT; failures (no CAP_SYS_NICE, non-Linux) only warn."""
+    if config.PIN_CPU is not None:
+        try:
+            os.sched_setaffinity(0, {config.PIN_CPU})
+            log.info("Pinned to CPU %d", config.PIN_CPU)
+        except (AttributeError, OSError) as e:
+            log.warning("Could not pin to CPU %d: %s", config.PIN_CPU, e)
+    if config.NICE_INCREMENT:
+        try:
+            os.nice(config.NICE_INCREMENT)
+            log.info("Niceness adjusted by %d", config.NICE_INCREMENT)
+        except (AttributeError, OSError) as e:
+            log.warning("Could not adjust niceness by %d (needs CAP_SYS_NICE): %s",
+                        config.NICE_INCREMENT, e)
+
+
+def _shutdown(client, quoted_markets: list[QuotedMarket]) -> None:
+    """Cancel every resting order; runs on the main thread after the loop exits."""
+    log.info("Cancelling all orders...")
+    cancel_all_quoted(client, quoted_markets)
+    log.info("All orders cancelled. Exiting.")
+
 
 def main():
     fmt = logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s",
@@ -37,12 +78,16 @@ def main():
     logfile = logging.FileHandler("mm.log")
     logfile.setFormatter(fmt)
     root.addHandler(logfile)
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    # Transport libraries log per request; keep them quiet so their gates short-circuit
+    for name in ("httpx", "httpcore", "urllib3", "websocket"):
+        logging.getLogger(name).setLevel(logging.WARNING)
 
     # 1. Initialize client
     log.info("Initializing CLOB client...")
     client = build_client()
+    # Before tune_scheduling, so the signing workers don't inherit the CPU pin
+    signing.start(client, config.SIGN_WORKERS)
+    tune_scheduling()
 
     # 2. Check balance
     balance = get_usdc_balance(client)
@@ -71,16 +116,30 @@ def main():
         log.warning("Balance $%.2f < needed $%.0f for %d markets. Some may be undersized.",
                     balance, total_needed, len(markets))
 
-    # 4. Place initial quotes
+    # Graceful shutdown on Ctrl+C (installed before any order goes out)
+    signal.signal(signal.SIGINT, _handle_sigint)
+
+    # 4. Place initial quotes (all starting mids in one /midpoints call)
+    try:
+        mids = get_midpoints(client, [m.yes_token_id for m in markets])
+    except Exception as e:
+        log.warning("Batch midpoint fetch failed, falling back to per-market: %s", e)
+        mids = {}
     quoted_markets: list[QuotedMarket] = []
     for market in markets:
+        if _stop.is_set():
+            break
         if market.max_incentive_spread <= 0:
             log.warning("%s: no incentive spread set, skipping", market.ticker)
             continue
-        qm = place_quotes(client, market)
+        qm = place_quotes(client, market, mids.get(market.yes_token_id))
         if qm:
             quoted_markets.append(qm)
 
+    if _stop.is_set():
+        _shutdown(client, quoted_markets)
+        return
+
     if not quoted_markets:
         log.error("No quotes placed. Exiting.")
         sys.exit(1)
@@ -88,30 +147,45 @@ def main():
     log.info("Placed quotes on %d markets. Entering monitor loop (poll every %ds)...",
              len(quoted_markets), config.POLL_INTERVAL_SECONDS)
 
-    # Graceful shutdown on Ctrl+C
-    def handle_sigint(sig, frame):
-        log.info("SIGINT received, cancelling all orders...")
-        cancel_all_quoted(client, quoted_markets)
-        log.info("All orders cancelled. Exiting.")
-        sys.exit(0)
-
-    signal.signal(signal.SIGINT, handle_sigint)
-
-    # 5. Monitor loop
-    while True:
-        time.sleep(config.POLL_INTERVAL_SECONDS)
-
+    # Local books from the market WebSocket; REST /midpoints stays as the fallback
+    mid_cache = None
+    if MidpointCache.available():
+        mid_cache = MidpointCache([qm.market.yes_token_id for qm in quoted_markets])
+        mid_cache.start()
+    else:
+        log.warning("websocket-client not installed, polling midpoints over REST")
+    # Balances only re-read after our own fills (user WebSocket) or on a slow heartbeat
+    positions = PositionTracker(client.creds, [qm.market for qm in quoted_markets])
+    positions.start()
+
+    # 5. Monitor loop (wait() returns early as soon as SIGINT sets _stop)
+    while not _stop.wait(config.POLL_INTERVAL_SECONDS):
         # Parallel fetch all balances + midpoints
         print()
-        market_data = fetch_market_data(client, quoted_markets)
+        market_data = fetch_market_data(client, quoted_markets, mid_cache, positions)
+
+        # Plan every market first, then cancel/post across all of them at once;
+        # one clock read per cycle keeps every market's exit math consistent
+        now = time.monotonic()
+        plans: list[CyclePlan] = []
+        for qm, (yes_bal, no_bal, mid) in zip(quoted_markets, market_data):
+            if _stop.is_set():
+                break
+            try:
+                plans.append(plan_market_cycle(client, qm, yes_bal, no_bal, mid, now))
+            except Exception:
+                log.exception("Error processing %s", qm.market.ticker)
 
-        for i, (qm, (yes_bal, no_bal, mid)) in enumerate(
-            zip(quoted_markets, market_data)
-        ):
+        if plans and not _stop.is_set():
             try:
-                quoted_markets[i] = process_market_cycle(client, qm, yes_bal, no_bal, mid)
-            except Exception as e:
-                log.error("Error processing %s: %s", qm.market.ticker, e)
+                apply_cycle_plans(client, plans)
+            except Exception:
+                log.exception("Error applying cycle")
+
+    if mid_cache is not None:
+        mid_cache.stop()
+    positions.stop()
+    _shutdown(client, quoted_markets)
 
 
 if __name__ == "__main__":
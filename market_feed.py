@@ -0,0 +1,130 @@
+"""
+Market-channel WebSocket feed — keeps a local L2 book per token from the
+initial `book` snapshot plus `price_change` deltas, so midpoints can be read
+in O(1) instead of polled over REST every cycle.
+
+Requires `websocket-client`; callers should check MidpointCache.available()
+and keep using REST midpoints when it isn't installed.
+"""
+import json
+import logging
+import threading
+import time
+
+from http_session import json_loads
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+log = logging.getLogger(__name__)
+
+WS_MARKET_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+PING_INTERVAL_SECONDS = 10.0
+RECONNECT_DELAY_SECONDS = 2.0
+STALE_SECONDS = 15.0  # books are trusted only while the socket has spoken this recently
+
+
+class MidpointCache:
+    """Background thread maintaining best bid/ask for `token_ids`; get() returns None when unsure."""
+
+    def __init__(self, token_ids: list[str]):
+        self._token_ids = list(token_ids)
+        # token_id -> (bids {price: size}, asks {price: size})
+        self._books: dict[str, tuple[dict[float, float], dict[float, float]]] = {}
+        self._lock = threading.Lock()
+        self._last_msg = 0.0  # monotonic time of the last frame (incl. PONG)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._ws = None
+
+    @staticmethod
+    def available() -> bool:
+        return websocket is not None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="market-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def get(self, token_id: str) -> float | None:
+        """Local midpoint for `token_id`, or None if the book is missing, one-sided or stale."""
+        if time.monotonic() - self._last_msg > STALE_SECONDS:
+            return None
+        with self._lock:
+            book = self._books.get(token_id)
+            if book is None or not book[0] or not book[1]:
+                return None
+            return (max(book[0]) + min(book[1])) / 2
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                WS_MARKET_URL,
+                on_open=self._handle_open,
+                on_message=self._handle_message,
+                on_error=lambda ws, e: log.warning("Market feed error: %s", e),
+            )
+            self._ws.run_forever()
+            # Deltas missed while disconnected would corrupt the books; wait for fresh snapshots
+            with self._lock:
+                self._books.clear()
+            if not self._stop.is_set():
+                log.warning("Market feed disconnected, reconnecting in %.0fs", RECONNECT_DELAY_SECONDS)
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+
+    def _handle_open(self, ws) -> None:
+        ws.send(json.dumps({"assets_ids": self._token_ids, "type": "market"}))
+        log.info("Market feed subscribed to %d tokens", len(self._token_ids))
+        threading.Thread(target=self._ping, args=(ws,), name="market-feed-ping", daemon=True).start()
+
+    def _ping(self, ws) -> None:
+        while not self._stop.wait(PING_INTERVAL_SECONDS):
+            try:
+                ws.send("PING")
+            except Exception:
+                return
+
+    def _handle_message(self, ws, message: str) -> None:
+        self._last_msg = time.monotonic()
+        if message == "PONG":
+            return
+        try:
+            data = json_loads(message)
+        except ValueError:
+            return
+        with self._lock:
+            for event in data if isinstance(data, list) else [data]:
+                kind = event.get("event_type")
+                if kind == "book":
+                    self._apply_snapshot(event)
+                elif kind == "price_change":
+                    self._apply_changes(event)
+
+    def _apply_snapshot(self, event: dict) -> None:
+        bids = {float(lvl["price"]): float(lvl["size"])
+                for lvl in event.get("bids") or event.get("buys") or ()}
+        asks = {float(lvl["price"]): float(lvl["size"])
+                for lvl in event.get("asks") or event.get("sells") or ()}
+        self._books[event["asset_id"]] = (
+            {p: s for p, s in bids.items() if s > 0},
+            {p: s for p, s in asks.items() if s > 0},
+        )
+
+    def _apply_changes(self, event: dict) -> None:
+        # Newer payloads carry asset_id per change; older ones once per event
+        for change in event.get("price_changes") or event.get("changes") or ():
+            book = self._books.get(change.get("asset_id") or event.get("asset_id"))
+            if book is None:
+                continue  # no snapshot yet; a delta alone can't build a book
+            side = book[0] if change.get("side") == "BUY" else book[1]
+            price, size = float(change["price"]), float(change["size"])
+            if size > 0:
+                side[price] = size
+            else:
+                side.pop(price, None)
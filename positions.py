@@ -0,0 +1,69 @@
+"""
+In-memory token balances for the quoting loop. Balances are re-read over REST
+only for markets with a recent fill on the user WebSocket, or on a slow
+reconcile heartbeat, instead of two balance calls per market every cycle.
+
+Without `websocket-client`, or while the user WebSocket is down or silent,
+every balance is simply fetched each cycle.
+"""
+import threading
+import time
+
+from py_clob_client.clob_types import ApiCreds
+
+import config
+from discovery import Market
+from user_feed import UserFeed
+
+
+class PositionTracker:
+    """Cached balances per token, invalidated by our own trade events."""
+
+    def __init__(self, creds: ApiCreds, markets: list[Market]):
+        self._tokens = {m.condition_id: (m.yes_token_id, m.no_token_id) for m in markets}
+        self._balances: dict[str, tuple[float, float]] = {}  # token_id -> (fetched_at, shares)
+        self._dirty_until: dict[str, float] = {}  # token_id -> refetch every cycle until then
+        self._lock = threading.Lock()
+        self._feed = (UserFeed(creds, list(self._tokens), self._on_trade, self._on_connect)
+                      if UserFeed.available() else None)
+
+    def start(self) -> None:
+        if self._feed is not None:
+            self._feed.start()
+
+    def stop(self) -> None:
+        if self._feed is not None:
+            self._feed.stop()
+
+    def cached(self, token_id: str, now: float) -> float | None:
+        """The cached balance if it can be trusted at `now`, else None (fetch it)."""
+        # A fill missed while the feed is down would leave the cache wrong until reconcile
+        if self._feed is None or not self._feed.live():
+            return None
+        with self._lock:
+            entry = self._balances.get(token_id)
+            if entry is None or now < self._dirty_until.get(token_id, 0.0):
+                return None
+            if now - entry[0] > config.POSITION_RECONCILE_SECONDS:
+                return None
+            return entry[1]
+
+    def update(self, token_id: str, shares: float, now: float) -> None:
+        with self._lock:
+            self._balances[token_id] = (now, shares)
+
+    def _on_trade(self, condition_id: str) -> None:
+        tokens = self._tokens.get(condition_id)
+        if tokens is not None:
+            self._mark_dirty(tokens)
+
+    def _on_connect(self) -> None:
+        # Fills during the outage never reached us; re-read everything
+        self._mark_dirty([t for tokens in self._tokens.values() for t in tokens])
+
+    def _mark_dirty(self, token_ids: list[str] | tuple[str, ...]) -> None:
+        # Keep refetching for a few seconds: the balance endpoint can lag the fill
+        until = time.time() + config.POSITION_DIRTY_SECONDS
+        with self._lock:
+            for token_id in token_ids:
+                self._dirty_until[token_id] = until
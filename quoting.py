@@ -1,23 +1,95 @@
+import atexit
 import logging
 import math
 import time
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from operator import attrgetter
 
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderArgs, OrderType
+from py_clob_client.clob_types import BookParams, OrderArgs, OrderType, PostOrdersArgs
+from py_clob_client.exceptions import PolyApiException
 
 import config
 from discovery import Market
-from inventory import get_token_balance
+from inventory import MICRO, get_token_balance, get_token_balances_batch
+from market_feed import MidpointCache
+from positions import PositionTracker
+from signing import sign_order
 
 log = logging.getLogger(__name__)
 
 SIDE_BUY = "BUY"
 SIDE_SELL = "SELL"
+MAX_FETCH_WORKERS = 32  # concurrent balance/midpoint requests per cycle
+PRESIGNED_POOL_SIZE = 64  # signed-but-unposted orders kept per market
+POST_BATCH_SIZE = 15  # CLOB cap on orders per POST /orders
+CANCEL_CHUNK_SIZE = 500  # order IDs per DELETE /orders
+CANCEL_TIMEOUT_SECONDS = 10.0
+FETCH_TIMEOUT_SECONDS = 5.0  # per-cycle budget for balance/midpoint fetches
+BATCH_BALANCE_BACKOFF_SECONDS = 60.0  # after an RPC failure, use per-token reads this long
+THROTTLE_RETRIES = 3  # attempts per batch call while the CLOB answers 429/5xx
+THROTTLE_BACKOFF_SECONDS = 0.25  # doubled after each throttled attempt
+
+# What one failed CLOB request can raise: API and transport errors (PolyApiException
+# wraps httpx failures), prices sign_order rejects, and our own deadlines.
+# Anything else is a bug and is left to the per-market safety nets.
+# Future timeouts only alias the builtin TimeoutError from Python 3.11 on.
+_ORDER_ERRORS = (PolyApiException, ValueError, TimeoutError, FutureTimeoutError)
+
+# Long-lived I/O pool for fetches and order posts: threads survive across cycles,
+# so the hot path never pays thread spawn/teardown
+_POOL = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix="clob-io")
+atexit.register(_POOL.shutdown, wait=False)
+# Cancels get their own workers so risk-reducing requests never queue behind posts
+_CANCEL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="clob-cancel")
+atexit.register(_CANCEL_POOL.shutdown, wait=False)
+# time.time() before which the on-chain batch balance read is skipped
+_batch_balance_off_until = 0.0
+# Reads still running after an earlier cycle's deadline; joined rather than
+# duplicated, so a slow backend doesn't pile up one more request per cycle
+_inflight_mids: Future | None = None
+_inflight_balances: dict[str, Future] = {}  # token_id -> per-token balance read
+
+
+class OrderTemplatePool:
+    """LRU of signed orders that were never posted, keyed by (token, side, price_ticks, size).
+
+    Entries are popped on use: a posted (even cancelled) order can't be resubmitted,
+    so only signatures that never reached the exchange are recycled.
+    """
+    __slots__ = ("_orders",)
+
+    def __init__(self):
+        self._orders: OrderedDict[tuple, object] = OrderedDict()
+
+    def sign(self, client: ClobClient, args: OrderArgs, ticks_per_unit: int) -> Future:
+        """Future of a cached signed order for `args` if one exists, else of a fresh signing."""
+        order = self._orders.pop(self.key(args, ticks_per_unit), None)
+        if order is None:
+            return sign_order(client, args)
+        future = Future()
+        future.set_result(order)
+        return future
+
+    def put_back(self, args: OrderArgs, ticks_per_unit: int, order) -> None:
+        self._orders[self.key(args, ticks_per_unit)] = order
+        while len(self._orders) > PRESIGNED_POOL_SIZE:
+            self._orders.popitem(last=False)
+
+    @staticmethod
+    def key(args: OrderArgs, ticks_per_unit: int) -> tuple:
+        return args.token_id, args.side, price_to_ticks(args.price, ticks_per_unit), args.size
+
+
+# Every order-ID slot on QuotedMarket, fetched in one C-level call
+_ID_FIELDS = ("bid_order_id", "ask_order_id", "yes_exit_order_id", "no_exit_order_id")
+_get_order_ids = attrgetter(*_ID_FIELDS)
 
 
-@dataclass
+@dataclass(slots=True)
 class QuotedMarket:
     market: Market
     bid_order_id: str | None = None
@@ -25,22 +97,54 @@ class QuotedMarket:
     yes_exit_order_id: str | None = None
     no_exit_order_id: str | None = None
     mid_at_placement: float = 0.0
-    inventory_since: float | None = None
+    inventory_since: float | None = None  # time.monotonic() when inventory appeared
     entry_mid: float = 0.0
     entry_bid_price: float = 0.0    # actual bid price placed (cost basis for YES fills)
     entry_ask_price: float = 0.0    # actual ask price placed (cost basis for NO fills)
     exit_price_placed: float = 0.0
-    exit_cooldown_until: float = 0.0  # don't retry exits before this timestamp
+    exit_cooldown_until: float = 0.0  # don't retry exits before this monotonic time
+    exit_recheck_at: float = 0.0  # exit target can't move before this (barring a stop-loss)
+    resync: bool = False  # orders may be live without recorded IDs: cancel the whole market
+    presigned: OrderTemplatePool = field(default_factory=OrderTemplatePool)
+
+    def order_ids(self) -> list[str]:
+        """All live order IDs (quotes + exits)."""
+        return [oid for oid in _get_order_ids(self) if oid]
+
+    def reset(self, exits: bool = True) -> None:
+        """Forget cancelled order IDs in place (quotes, plus exits unless exits=False)."""
+        self.bid_order_id = None
+        self.ask_order_id = None
+        if exits:
+            self.yes_exit_order_id = None
+            self.no_exit_order_id = None
+
+
+@dataclass(slots=True)
+class PendingOrder:
+    """A signed quote waiting for the cycle's batched POST."""
+    qm: QuotedMarket
+    slot: str           # "bid" or "ask"
+    order: object       # signed order from sign_order
+    price: float        # YES-space price (bid, or the ask the NO leg mirrors)
+    no_price: float     # NO-token price actually posted for the ask leg
+    size: float
+    mid: float
+
+
+def price_to_ticks(price: float, ticks_per_unit: int) -> int:
+    """Snap a price to the nearest whole tick, half-up (prices are never negative)."""
+    return int(price * ticks_per_unit + 0.5)
 
 
-def _round_to_tick(price: float, tick_size: str) -> float:
-    """Round price to the nearest tick."""
-    tick = float(tick_size)
-    return round(round(price / tick) * tick, 4)
+def ticks_to_price(ticks: int, ticks_per_unit: int) -> float:
+    """Convert integer ticks back to a price, only at the order boundary.
+    Dividing by the integer denominator is exact to the nearest float: no round() needed."""
+    return ticks / ticks_per_unit
 
 
-def _clamp(price: float, lo: float = 0.01, hi: float = 0.99) -> float:
-    return max(lo, min(hi, price))
+def _clamp(ticks: int, lo: int, hi: int) -> int:
+    return max(lo, min(hi, ticks))
 
 
 def get_midpoint(client: ClobClient, token_id: str) -> float | None:
@@ -51,30 +155,40 @@ def get_midpoint(client: ClobClient, token_id: str) -> float | None:
         if mid <= 0:
             return None
         return mid
-    except Exception as e:
+    except _ORDER_ERRORS as e:
         log.error("Failed to get midpoint for %s: %s", token_id[:16], e)
         return None
 
 
-def compute_quotes(market: Market, midpoint: float) -> tuple[float, float]:
-    """
-    Compute bid and ask prices around the midpoint.
-    Returns (bid_price, ask_price), clamped to [0.001, 0.999].
-    """
-    half_spread = market.max_incentive_spread * config.SPREAD_PCT
-    bid = midpoint - half_spread
-    ask = midpoint + half_spread
+def get_midpoints(client: ClobClient, token_ids: list[str]) -> dict[str, float]:
+    """Fetch midpoints for many tokens in one /midpoints call. Tokens without a mid are omitted."""
+    resp = client.get_midpoints([BookParams(token_id=t) for t in token_ids])
+    mids: dict[str, float] = {}
+    for token_id, mid in (resp or {}).items():
+        mid = float(mid)
+        if mid > 0:
+            mids[token_id] = mid
+    return mids
 
-    bid = _clamp(_round_to_tick(bid, market.tick_size), 0.001, 0.999)
-    ask = _clamp(_round_to_tick(ask, market.tick_size), 0.001, 0.999)
 
-    # Ensure bid < ask
+def compute_quotes(market: Market, midpoint: float) -> tuple[int, int]:
+    """
+    Compute bid and ask around the midpoint in integer ticks: mid -/+ half_spread,
+    each rounded from its exact value to the nearest tick. Exact ties (after
+    snapping float noise) round away from the mid, so the quotes stay symmetric
+    and never sit inside half_spread. Falls back to mid ± 1 tick if both land
+    on one tick. Returns (bid_ticks, ask_ticks), at least one tick inside [0, 1].
+    """
+    tpu = market.ticks_per_unit
+    mid = midpoint * tpu
+    half = market.half_spread * tpu
+    # round(x, 9) turns e.g. 14.499999999999998 back into the tie it represents
+    bid = math.ceil(round(mid - half, 9) - 0.5)   # nearest tick, ties down
+    ask = math.floor(round(mid + half, 9) + 0.5)  # nearest tick, ties up
     if bid >= ask:
-        tick = float(market.tick_size)
-        bid = _clamp(midpoint - tick, 0.001, 0.999)
-        ask = _clamp(midpoint + tick, 0.001, 0.999)
-
-    return bid, ask
+        mid_ticks = math.floor(round(mid, 9) + 0.5)
+        bid, ask = mid_ticks - 1, mid_ticks + 1
+    return _clamp(bid, 1, tpu - 1), _clamp(ask, 1, tpu - 1)
 
 
 def compute_size(market: Market) -> float:
@@ -91,6 +205,7 @@ def compute_exit_price(
     entry_mid: float,
     entry_price: float,
     side: str,
+    now: float,
 ) -> float:
     """Compute exit price in native token space, anchored to entry cost.
 
@@ -98,38 +213,65 @@ def compute_exit_price(
 
     Escalation: full-spread profit at t=0, breakeven at t=1.
     Stop-loss: if mid moves against position by >= STOP_LOSS_PCT, snap to mid.
+    `now` and `inventory_since` are time.monotonic() values.
     """
-    elapsed = time.time() - inventory_since
+    elapsed = now - inventory_since
     t = min(elapsed / config.EXIT_ESCALATION_SECONDS, 1.0)
 
-    half_spread = market.max_incentive_spread * config.SPREAD_PCT
+    tpu = market.ticks_per_unit
+    lo, hi = market.tick_lo, market.tick_hi
+
+    sgn = 1.0 if side == "YES" else -1.0
+    mid_ticks = price_to_ticks(mid, tpu)
+    entry_ticks = price_to_ticks(entry_price, tpu)
+    # Own-token mid and cost basis (NO trades at the complement of YES)
+    stop_ticks = mid_ticks if side == "YES" else tpu - mid_ticks
+    cost_ticks = entry_ticks if side == "YES" else tpu - entry_ticks
 
     # Stop-loss: only trigger when mid moves AGAINST our position
-    if entry_mid > 0:
-        if side == "YES":
-            loss_pct = (entry_mid - mid) / entry_mid  # mid dropping = loss
-        else:
-            loss_pct = (mid - entry_mid) / entry_mid  # mid rising = loss for NO
-        if loss_pct >= config.STOP_LOSS_PCT:
-            if side == "YES":
-                return _clamp(_round_to_tick(mid, market.tick_size), 0.01, 0.99)
-            else:
-                return _clamp(_round_to_tick(1.0 - mid, market.tick_size), 0.01, 0.99)
+    stop_hit = _stop_loss_hit(entry_mid, mid, sgn)
+    # Otherwise sell at cost + edge, decaying to breakeven
+    ticks = stop_ticks if stop_hit else cost_ticks + int(market.half_spread * tpu * (1.0 - t) + 0.5)
+
+    return ticks_to_price(_clamp(ticks, lo, hi), tpu)
+
+
+def _stop_loss_hit(entry_mid: float, mid: float, sgn: float) -> bool:
+    """Mid moved against the position by >= STOP_LOSS_PCT (sgn: +1 YES, -1 NO; YES
+    profits when mid rises, NO when it falls)."""
+    return entry_mid > 0 and sgn * (entry_mid - mid) / entry_mid >= config.STOP_LOSS_PCT
 
-    if side == "YES":
-        # Bought YES at entry_price. Sell at entry_price + edge, decaying to breakeven.
-        price = entry_price + half_spread * (1.0 - t)
-    else:
-        # Bought NO at (1 - entry_price). Sell NO at cost + edge, decaying to breakeven.
-        no_cost = 1.0 - entry_price
-        price = no_cost + half_spread * (1.0 - t)
 
-    return _clamp(_round_to_tick(price, market.tick_size), 0.01, 0.99)
+def _exit_stable_until(market: Market, inventory_since: float, now: float) -> float:
+    """Monotonic time until which the escalating exit keeps its current tick.
 
+    The edge over cost is int(H * (1 - t) + 0.5) ticks with H = half_spread in ticks,
+    so it next drops once H * (1 - t) falls below (edge - 0.5)."""
+    h = market.half_spread * market.ticks_per_unit
+    t = min((now - inventory_since) / config.EXIT_ESCALATION_SECONDS, 1.0)
+    edge = int(h * (1.0 - t) + 0.5)
+    if edge == 0:
+        return math.inf  # fully decayed to breakeven
+    return inventory_since + (1.0 - (edge - 0.5) / h) * config.EXIT_ESCALATION_SECONDS
 
-def place_quotes(client: ClobClient, market: Market) -> QuotedMarket | None:
-    """Place two-sided GTC limit orders on the YES token."""
-    mid = get_midpoint(client, market.yes_token_id)
+
+def _place_one(client: ClobClient, qm: QuotedMarket, slot: str, token_id: str,
+               price: float, size: float, side: str) -> str | None:
+    """Sign and post one GTC order, storing its ID in `qm.<slot>`. Raises on failure."""
+    order = sign_order(client, OrderArgs(token_id=token_id, price=price,
+                                         size=size, side=side)).result()
+    resp = client.post_order(order, orderType=OrderType.GTC)
+    order_id = resp.get("orderID") or resp.get("id")
+    setattr(qm, slot, order_id)
+    return order_id
+
+
+def place_quotes(client: ClobClient, market: Market,
+                 mid: float | None = None) -> QuotedMarket | None:
+    """Place two-sided GTC limit orders on the YES token.
+    `mid` may be passed in from a batch get_midpoints call; otherwise it is fetched."""
+    if mid is None:
+        mid = get_midpoint(client, market.yes_token_id)
     if mid is None:
         log.error("Cannot get midpoint for %s, skipping", market.ticker)
         return None
@@ -139,116 +281,192 @@ def place_quotes(client: ClobClient, market: Market) -> QuotedMarket | None:
                     market.ticker, mid, config.MIN_QUOTABLE_MID)
         return None
 
-    bid_price, ask_price = compute_quotes(market, mid)
+    bid_ticks, ask_ticks = compute_quotes(market, mid)
+    tpu = market.ticks_per_unit
+    bid_price, ask_price = ticks_to_price(bid_ticks, tpu), ticks_to_price(ask_ticks, tpu)
+    no_price = ticks_to_price(tpu - ask_ticks, tpu)  # yes + no == 1 exactly, in ticks
     size = compute_size(market)
 
     quoted = QuotedMarket(market=market, mid_at_placement=mid,
                           entry_bid_price=bid_price, entry_ask_price=ask_price)
 
-    # Place BUY order
-    try:
-        bid_order = client.create_order(
-            OrderArgs(
-                token_id=market.yes_token_id,
-                price=bid_price,
-                size=size,
-                side=SIDE_BUY,
-            )
-        )
-        resp = client.post_order(bid_order, orderType=OrderType.GTC)
-        quoted.bid_order_id = resp.get("orderID") or resp.get("id")
-        log.info("%s BUY  %.2f @ $%.3f -> order %s",
-                 market.ticker, size, bid_price, quoted.bid_order_id)
-    except Exception as e:
-        log.error("%s BUY order failed: %s", market.ticker, e)
-
-    # Place ask side: BUY NO at (1 - ask_price), equivalent to SELL YES at ask_price
-    no_price = _round_to_tick(1.0 - ask_price, market.tick_size)
-    try:
-        ask_order = client.create_order(
-            OrderArgs(
-                token_id=market.no_token_id,
-                price=no_price,
-                size=size,
-                side=SIDE_BUY,
-            )
-        )
-        resp = client.post_order(ask_order, orderType=OrderType.GTC)
-        quoted.ask_order_id = resp.get("orderID") or resp.get("id")
-        log.info("%s BUY NO %.2f @ $%.3f (= SELL YES @ $%.3f) -> order %s",
-                 market.ticker, size, no_price, ask_price, quoted.ask_order_id)
-    except Exception as e:
-        log.error("%s BUY NO order failed: %s", market.ticker, e)
+    # (slot, token, price, label, note); the ask is BUY NO at 1 - ask == SELL YES at ask
+    specs = (
+        ("bid_order_id", market.yes_token_id, bid_price, "BUY YES", ""),
+        ("ask_order_id", market.no_token_id, no_price, "BUY NO",
+         f" (= SELL YES @ ${ask_price:.3f})"),
+    )
+
+    def place(slot: str, token_id: str, price: float, label: str, note: str) -> None:
+        try:
+            order_id = _place_one(client, quoted, slot, token_id, price, size, SIDE_BUY)
+            log.info("%s %s %.2f @ $%.3f%s -> order %s",
+                     market.ticker, label, size, price, note, order_id)
+        except _ORDER_ERRORS as e:
+            log.error("%s %s order failed: %s", market.ticker, label, e)
+
+    # Post both sides concurrently: latency is max(bid, ask), not the sum
+    for future in [_POOL.submit(place, *spec) for spec in specs]:
+        future.result()
 
     return quoted
 
 
+def _remaining(deadline: float) -> float:
+    return max(0.0, deadline - time.monotonic())
+
+
 def fetch_market_data(
     client: ClobClient,
     quoted_markets: list[QuotedMarket],
+    mid_cache: MidpointCache | None = None,
+    positions: PositionTracker | None = None,
 ) -> list[tuple[float, float, float | None]]:
-    """Fetch all balances + midpoints in parallel across all markets.
+    """Fetch all balances in one batch call (per-token fallback) and every midpoint in another.
+    Midpoints available from `mid_cache` (WebSocket books) and balances still
+    trusted by `positions` (no recent fill) skip REST entirely.
 
     Returns a list of (yes_bal, no_bal, mid) tuples, one per market.
     """
-    # Build (index, callable) work items
-    results: dict[int, dict[str, float | None]] = {
-        i: {"yes_bal": None, "no_bal": None, "mid": None}
-        for i in range(len(quoted_markets))
-    }
-    work: list[tuple[int, str, callable]] = []
+    # One deadline for the whole fetch; stragglers past it stay None (failed)
+    deadline = time.monotonic() + FETCH_TIMEOUT_SECONDS
+    # Preallocated per-market columns; None marks a failed fetch
+    n = len(quoted_markets)
+    yes_bals: list[float | None] = [None] * n
+    no_bals: list[float | None] = [None] * n
+    columns = (yes_bals, no_bals)
+    token_ids = [qm.market.yes_token_id for qm in quoted_markets]
+    mids: dict[str, float] = {}
+    if mid_cache is not None:
+        for t in token_ids:
+            mid = mid_cache.get(t)
+            if mid is not None:
+                mids[t] = mid
+    # Each token is requested at most once, even if two markets share it
+    missing = list(dict.fromkeys(t for t in token_ids if t not in mids))
+
+    # All requests in flight at once on the shared pool, so a cycle costs ~max RTT.
+    # Submit the function and args directly: no per-task closure to build or call.
+    global _inflight_mids, _batch_balance_off_until
+    mids_future = None
+    if missing:
+        if _inflight_mids is None or _inflight_mids.done():
+            _inflight_mids = _POOL.submit(_retry_throttled, get_midpoints, client, missing)
+        mids_future = _inflight_mids
+    now = time.time()
+    where: dict[str, list[tuple[int, int]]] = {}  # token_id -> (index, column) to fill
     for i, qm in enumerate(quoted_markets):
         m = qm.market
-        work.append((i, "yes_bal", lambda c=client, t=m.yes_token_id: get_token_balance(c, t)))
-        work.append((i, "no_bal", lambda c=client, t=m.no_token_id: get_token_balance(c, t)))
-        work.append((i, "mid", lambda c=client, t=m.yes_token_id: get_midpoint(c, t)))
-
-    with ThreadPoolExecutor(max_workers=min(len(work), 3)) as pool:
-        futures = {pool.submit(fn): (idx, key) for idx, key, fn in work}
-        for future in futures:
-            idx, key = futures[future]
-            try:
-                results[idx][key] = future.result()
-            except Exception as e:
-                ticker = quoted_markets[idx].market.ticker
-                log.error("%s fetch %s failed: %s", ticker, key, e)
+        for col, token_id in ((0, m.yes_token_id), (1, m.no_token_id)):
+            bal = positions.cached(token_id, now) if positions is not None else None
+            if bal is not None:
+                columns[col][i] = bal
+            else:
+                where.setdefault(token_id, []).append((i, col))
+
+    balances: dict[str, float] = {}
+    # Every balance in one on-chain balanceOfBatch; per-token CLOB reads only as fallback
+    if where and now >= _batch_balance_off_until:
+        owner = config.FUNDER_ADDRESS or client.get_address()
+        try:
+            balances.update(_POOL.submit(get_token_balances_batch, owner, list(where))
+                            .result(timeout=_remaining(deadline)))
+        except Exception as e:
+            _batch_balance_off_until = now + BATCH_BALANCE_BACKOFF_SECONDS
+            log.warning("Batch balance fetch failed, per-token reads for %.0fs: %s",
+                        BATCH_BALANCE_BACKOFF_SECONDS, e)
+    futures: dict[Future, str] = {}
+    for token_id in where:
+        if token_id in balances:
+            continue
+        future = _inflight_balances.get(token_id)
+        if future is None or future.done():
+            future = _inflight_balances[token_id] = _POOL.submit(get_token_balance, client, token_id)
+        futures[future] = token_id
+    if futures:
+        try:
+            for future in as_completed(futures, timeout=_remaining(deadline)):
+                token_id = futures[future]
+                try:
+                    balances[token_id] = future.result()
+                except Exception as e:
+                    idx, col = where[token_id][0]
+                    ticker = quoted_markets[idx].market.ticker
+                    log.error("%s fetch %s failed: %s", ticker, ("yes_bal", "no_bal")[col], e)
+        except FutureTimeoutError:
+            log.error("Balance fetch timed out, %d left unset",
+                      sum(not f.done() for f in futures))
+
+    for token_id, bal in balances.items():
+        for idx, col in where[token_id]:
+            columns[col][idx] = bal
+        if positions is not None:
+            positions.update(token_id, bal, now)
+    if mids_future is not None:
+        try:
+            mids.update(mids_future.result(timeout=_remaining(deadline)))
+        except Exception as e:
+            log.error("Batch midpoint fetch failed: %s", e)
+
+    return list(zip(yes_bals, no_bals, [mids.get(t) for t in token_ids]))
 
-    return [(r["yes_bal"], r["no_bal"], r["mid"]) for r in results.values()]
 
+@dataclass(slots=True)
+class CyclePlan:
+    """One market's side effects for a cycle, applied across markets by apply_cycle_plans."""
+    qm: QuotedMarket
+    to_cancel: list[str] = field(default_factory=list)  # slots whose orders die this cycle
+    forget: list[str] = field(default_factory=list)     # slots cleared even if the cancel fails
+    quotes: list[tuple[OrderArgs, PendingOrder]] = field(default_factory=list)  # signed, unposted
+    exits: tuple[float, float, float, float] | None = None  # (yes_bal, no_bal, mid, now) if due
+    resync: bool = False  # cancel every order on the market, requote next cycle
 
-def process_market_cycle(
+
+def plan_market_cycle(
     client: ClobClient,
     qm: QuotedMarket,
     yes_bal: float | None,
     no_bal: float | None,
     mid: float | None,
-) -> QuotedMarket:
-    """Unified per-market cycle: always quote (with asymmetric sizing) + manage exits."""
+    now: float,
+) -> CyclePlan:
+    """Decide one market's cycle: always quote (with asymmetric sizing) + manage exits.
+
+    Only signs orders and updates inventory bookkeeping; every cancel and post
+    is left to apply_cycle_plans so they can be batched across markets.
+    `now` is the cycle's time.monotonic(), shared by every market.
+    """
     market = qm.market
+    plan = CyclePlan(qm)
 
     has_yes = yes_bal is not None and yes_bal >= config.INVENTORY_MIN_SHARES
     has_no = no_bal is not None and no_bal >= config.INVENTORY_MIN_SHARES
     has_inventory = has_yes or has_no
 
+    # A batch post lost track of some orders: clear the market out before anything else
+    if qm.resync:
+        plan.resync = True
+        return plan
+
     # If balance fetch failed but we have active exit orders, don't change state
     if not has_inventory and (yes_bal is None or no_bal is None):
         if qm.yes_exit_order_id or qm.no_exit_order_id:
             log.warning("%s balance fetch failed, keeping current state", market.ticker)
-            return qm
+            return plan
 
     if mid is None:
         log.warning("%s no midpoint, skipping cycle", market.ticker)
-        return qm
+        return plan
 
     # Park if mid dropped below quotable threshold
     if mid < config.MIN_QUOTABLE_MID:
         log.warning("%s mid=%.3f below MIN_QUOTABLE_MID, parking", market.ticker, mid)
-        cancel_quoted(client, qm)
-        return qm
+        plan.to_cancel = [slot for slot in _ID_FIELDS if getattr(qm, slot)]
+        return plan
 
     # --- Track inventory entry state ---
     if has_inventory and qm.inventory_since is None:
-        qm.inventory_since = time.time()
+        qm.inventory_since = now
         qm.entry_mid = mid
         log.info("%s inventory detected (YES=%.1f NO=%.1f), entry_mid=%.3f",
                  market.ticker, yes_bal or 0, no_bal or 0, mid)
@@ -258,15 +476,11 @@ def process_market_cycle(
         qm.inventory_since = None
         qm.entry_mid = 0.0
         qm.exit_cooldown_until = 0.0
-        # Cancel stale exit orders
-        exit_ids = [oid for oid in (qm.yes_exit_order_id, qm.no_exit_order_id) if oid]
-        if exit_ids:
-            try:
-                client.cancel_orders(exit_ids)
-            except Exception as e:
-                log.error("%s cancel stale exits failed: %s", market.ticker, e)
-            qm.yes_exit_order_id = None
-            qm.no_exit_order_id = None
+        # Cancel stale exit orders (forgotten even if the cancel fails, as before)
+        for slot in ("yes_exit_order_id", "no_exit_order_id"):
+            if getattr(qm, slot):
+                plan.to_cancel.append(slot)
+                plan.forget.append(slot)
 
     # --- QUOTE MANAGEMENT (asymmetric sizing) ---
     # When holding inventory, stop quoting the side that would add to exposure
@@ -276,80 +490,277 @@ def process_market_cycle(
     # Cancel unwanted sides
     if not want_bid and qm.bid_order_id:
         log.info("%s cancelling bid (holding YES inventory)", market.ticker)
-        try:
-            client.cancel_orders([qm.bid_order_id])
-            qm.bid_order_id = None
-        except Exception as e:
-            log.error("%s cancel bid failed: %s", market.ticker, e)
+        plan.to_cancel.append("bid_order_id")
 
     if not want_ask and qm.ask_order_id:
         log.info("%s cancelling ask (holding NO inventory)", market.ticker)
-        try:
-            client.cancel_orders([qm.ask_order_id])
-            qm.ask_order_id = None
-        except Exception as e:
-            log.error("%s cancel ask failed: %s", market.ticker, e)
+        plan.to_cancel.append("ask_order_id")
 
     # Check drift on active quotes
     has_active_quotes = (want_bid and qm.bid_order_id) or (want_ask and qm.ask_order_id)
     needs_refresh = has_active_quotes and should_refresh(qm, mid, "QUOT ")
 
     # Determine which sides need (re)placement
-    needs_bid = want_bid and (qm.bid_order_id is None or needs_refresh)
-    needs_ask = want_ask and (qm.ask_order_id is None or needs_refresh)
+    needs_bid = want_bid and qm.bid_order_id is None
+    needs_ask = want_ask and qm.ask_order_id is None
+
+    if needs_bid or needs_ask or needs_refresh:
+        bid_ticks, ask_ticks = compute_quotes(market, mid)
+        tpu = market.ticks_per_unit
+
+    # Drift alone isn't worth a cancel+post: only replace quotes whose price moved a tick
+    if needs_refresh:
+        replace_bid = bool(want_bid and qm.bid_order_id) and \
+            bid_ticks != price_to_ticks(qm.entry_bid_price, tpu)
+        replace_ask = bool(want_ask and qm.ask_order_id) and \
+            ask_ticks != price_to_ticks(qm.entry_ask_price, tpu)
+        if replace_bid:
+            plan.to_cancel.append("bid_order_id")
+        if replace_ask:
+            plan.to_cancel.append("ask_order_id")
+        if not (replace_bid or replace_ask):
+            log.debug("%s quotes unchanged at mid=%.4f, keeping them", market.ticker, mid)
+            qm.mid_at_placement = mid  # restart the drift measurement from here
+        needs_bid = needs_bid or replace_bid
+        needs_ask = needs_ask or replace_ask
 
     if needs_bid or needs_ask:
-        # Cancel existing quotes before re-placing (for refresh)
-        if needs_refresh:
-            cancel_ids = [oid for oid in (qm.bid_order_id, qm.ask_order_id) if oid]
-            if cancel_ids:
-                try:
-                    client.cancel_orders(cancel_ids)
-                    qm.bid_order_id = None
-                    qm.ask_order_id = None
-                except Exception as e:
-                    log.error("%s cancel for refresh failed: %s", market.ticker, e)
-
-        bid_price, ask_price = compute_quotes(market, mid)
+        bid_price, ask_price = ticks_to_price(bid_ticks, tpu), ticks_to_price(ask_ticks, tpu)
+        no_price = ticks_to_price(tpu - ask_ticks, tpu)
         size = compute_size(market)
 
-        if needs_bid and qm.bid_order_id is None:
-            try:
-                order = client.create_order(
-                    OrderArgs(token_id=market.yes_token_id, price=bid_price,
-                              size=size, side=SIDE_BUY)
-                )
-                resp = client.post_order(order, orderType=OrderType.GTC)
-                qm.bid_order_id = resp.get("orderID") or resp.get("id")
-                qm.entry_bid_price = bid_price
-                qm.mid_at_placement = mid
-                log.info("%s BUY YES %.2f @ $%.3f -> %s",
-                         market.ticker, size, bid_price, qm.bid_order_id)
-            except Exception as e:
-                log.error("%s BUY YES failed: %s", market.ticker, e)
-
-        if needs_ask and qm.ask_order_id is None:
-            no_price = _round_to_tick(1.0 - ask_price, market.tick_size)
+        # Sign replacements before cancelling so the book is only empty for one POST;
+        # orders signed on an earlier cycle but never posted are reused from the pool
+        # (both legs sign in parallel when a signing process pool is running)
+        signing: list[tuple[str, OrderArgs, Future]] = []
+        if needs_bid:
+            args = OrderArgs(token_id=market.yes_token_id, price=bid_price,
+                             size=size, side=SIDE_BUY)
+            signing.append(("bid", args, qm.presigned.sign(client, args, tpu)))
+        if needs_ask:
+            args = OrderArgs(token_id=market.no_token_id, price=no_price,
+                             size=size, side=SIDE_BUY)
+            signing.append(("ask", args, qm.presigned.sign(client, args, tpu)))
+        for slot, args, future in signing:
             try:
-                order = client.create_order(
-                    OrderArgs(token_id=market.no_token_id, price=no_price,
-                              size=size, side=SIDE_BUY)
-                )
-                resp = client.post_order(order, orderType=OrderType.GTC)
-                qm.ask_order_id = resp.get("orderID") or resp.get("id")
-                qm.entry_ask_price = ask_price
-                qm.mid_at_placement = mid
-                log.info("%s BUY NO %.2f @ $%.3f (= SELL YES @ $%.3f) -> %s",
-                         market.ticker, size, no_price, ask_price, qm.ask_order_id)
-            except Exception as e:
-                log.error("%s BUY NO failed: %s", market.ticker, e)
+                order = future.result()
+            except _ORDER_ERRORS as e:
+                log.error("%s %s sign failed: %s", market.ticker,
+                          "BUY YES" if slot == "bid" else "BUY NO", e)
+                continue
+            plan.quotes.append((args, PendingOrder(
+                qm, slot, order, bid_price if slot == "bid" else ask_price,
+                no_price, size, mid)))
+
+    # Exits whose target price moved are re-placed by _manage_exits after the cancel
+    if has_inventory and now >= qm.exit_cooldown_until:
+        plan.to_cancel.extend(_stale_exit_slots(qm, mid, now))
+        plan.exits = (yes_bal if has_yes else 0.0, no_bal if has_no else 0.0, mid, now)
+
+    return plan
+
+
+def _apply_cancels(client: ClobClient, plans: list[CyclePlan]) -> None:
+    """One cancel request for every plan; on failure retry per market so one bad ID
+    can't keep every other market's orders alive."""
+    for p in plans:
+        if p.resync:
+            _resync_market(client, p.qm)
+    plans = [p for p in plans if p.to_cancel]
+    if not plans:
+        return
+    try:
+        _cancel_orders(client, [getattr(p.qm, slot) for p in plans for slot in p.to_cancel])
+        for p in plans:
+            p.forget = p.to_cancel
+    except _ORDER_ERRORS as e:
+        if len(plans) == 1:
+            log.error("%s cancel %s failed: %s", plans[0].qm.market.ticker,
+                      ", ".join(plans[0].to_cancel), e)
+        else:
+            log.warning("Batched cancel for %d markets failed, retrying per market: %s",
+                        len(plans), e)
+            for p in plans:
+                try:
+                    _cancel_orders(client, [getattr(p.qm, slot) for slot in p.to_cancel])
+                    p.forget = p.to_cancel
+                except _ORDER_ERRORS as e2:
+                    log.error("%s cancel %s failed: %s", p.qm.market.ticker,
+                              ", ".join(p.to_cancel), e2)
+    for p in plans:
+        for slot in p.forget:
+            setattr(p.qm, slot, None)
+
+
+def _resync_market(client: ClobClient, qm: QuotedMarket) -> None:
+    """Cancel every order on qm's market, recorded or not, and forget them all."""
+    try:
+        _CANCEL_POOL.submit(_retry_throttled, client.cancel_market_orders,
+                            qm.market.condition_id).result(timeout=CANCEL_TIMEOUT_SECONDS)
+    except _ORDER_ERRORS as e:
+        log.error("%s market-wide cancel failed, retrying next cycle: %s", qm.market.ticker, e)
+        return
+    log.info("%s cancelled all market orders (unrecorded order IDs), requoting", qm.market.ticker)
+    qm.reset()
+    qm.resync = False
+
+
+def apply_cycle_plans(client: ClobClient, plans: list[CyclePlan]) -> None:
+    """Apply plans from any number of markets: one cancel, batched quote posts, then exits."""
+    _apply_cancels(client, plans)
+
+    # Post whatever is still missing; anything left unsent (slot still occupied,
+    # e.g. its cancel failed) goes back to the pool for next cycle
+    to_post: list[PendingOrder] = []
+    for plan in plans:
+        qm = plan.qm
+        for args, p in plan.quotes:
+            if (qm.bid_order_id if p.slot == "bid" else qm.ask_order_id) is None:
+                to_post.append(p)
+            else:
+                qm.presigned.put_back(args, qm.market.ticks_per_unit, p.order)
+    post_pending(client, to_post)
 
     # --- EXIT MANAGEMENT ---
-    if has_inventory and time.time() >= qm.exit_cooldown_until:
-        _manage_exits(client, qm, yes_bal if has_yes else 0.0,
-                      no_bal if has_no else 0.0, mid)
+    for plan in plans:
+        if plan.exits is not None:
+            try:
+                _manage_exits(client, plan.qm, *plan.exits)
+            except Exception:
+                # Expected request failures are handled inside; this is a bug, keep the trace
+                log.exception("%s exit management failed", plan.qm.market.ticker)
+
 
-    return qm
+def _retry_throttled(fn, *args, idempotent: bool = True):
+    """fn(*args), retried with exponential backoff while the CLOB answers 429 (or 5xx,
+    for idempotent calls only: a 5xx POST may still have gone through)."""
+    for attempt in range(THROTTLE_RETRIES):
+        try:
+            return fn(*args)
+        except PolyApiException as e:
+            status = e.status_code or 0
+            retry = status == 429 or (idempotent and status >= 500)
+            if not retry or attempt == THROTTLE_RETRIES - 1:
+                raise
+            delay = THROTTLE_BACKOFF_SECONDS * 2 ** attempt
+            log.warning("CLOB answered %d, retrying in %.2fs", status, delay)
+            time.sleep(delay)
+
+
+def _cancel_orders(client: ClobClient, order_ids: list[str]) -> None:
+    """Cancel orders on the dedicated cancel pool, in concurrent chunks of CANCEL_CHUNK_SIZE.
+    Raises the first chunk's error (or FutureTimeoutError), like client.cancel_orders would."""
+    futures = [_CANCEL_POOL.submit(_retry_throttled, client.cancel_orders,
+                                   order_ids[i:i + CANCEL_CHUNK_SIZE])
+               for i in range(0, len(order_ids), CANCEL_CHUNK_SIZE)]
+    for future in futures:
+        future.result(timeout=CANCEL_TIMEOUT_SECONDS)
+
+
+def _record_quote(p: PendingOrder, resp: dict) -> bool:
+    """Apply one post_orders response to the quote slot it was posted for; True if accepted."""
+    qm, market = p.qm, p.qm.market
+    order_id = resp.get("orderID") or resp.get("id")
+    if not order_id or resp.get("success") is False:
+        log.error("%s %s rejected: %s", market.ticker,
+                  "BUY YES" if p.slot == "bid" else "BUY NO", resp.get("errorMsg"))
+        return False
+    qm.mid_at_placement = p.mid
+    if p.slot == "bid":
+        qm.bid_order_id = order_id
+        qm.entry_bid_price = p.price
+        log.debug("%s BUY YES %.2f @ $%.3f -> %s",
+                  market.ticker, p.size, p.price, order_id)
+    else:
+        qm.ask_order_id = order_id
+        qm.entry_ask_price = p.price
+        log.debug("%s BUY NO %.2f @ $%.3f (= SELL YES @ $%.3f) -> %s",
+                  market.ticker, p.size, p.no_price, p.price, order_id)
+    return True
+
+
+def post_pending(client: ClobClient, pending: list[PendingOrder]) -> None:
+    """Post signed quotes from any number of markets in as few POSTs as the CLOB allows."""
+    if not pending:
+        return
+    # Per-order confirmations are DEBUG; INFO gets one line per cycle
+    placed = 0
+    for start in range(0, len(pending), POST_BATCH_SIZE):
+        chunk = pending[start:start + POST_BATCH_SIZE]
+        try:
+            resps = _retry_throttled(
+                client.post_orders,
+                [PostOrdersArgs(order=p.order, orderType=OrderType.GTC) for p in chunk],
+                idempotent=False)
+        except _ORDER_ERRORS as e:
+            tickers = sorted({p.qm.market.ticker for p in chunk})
+            # A 5xx or transport failure may still have been accepted: orders live untracked
+            unsure = isinstance(e, PolyApiException) and (e.status_code is None
+                                                          or e.status_code >= 500)
+            log.error("Batch post of %d orders (%s) failed%s: %s",
+                      len(chunk), ", ".join(tickers),
+                      ", resyncing those markets" if unsure else "", e)
+            if unsure:
+                for p in chunk:
+                    p.qm.resync = True
+            continue
+        if not isinstance(resps, list) or len(resps) != len(chunk):
+            # Responses can't be matched to orders, so some may be live untracked
+            tickers = sorted({p.qm.market.ticker for p in chunk})
+            log.error("Batch post of %d orders (%s) got %s responses, resyncing those markets",
+                      len(chunk), ", ".join(tickers),
+                      len(resps) if isinstance(resps, list) else "no")
+            for p in chunk:
+                p.qm.resync = True
+            continue
+        for p, resp in zip(chunk, resps):
+            placed += _record_quote(p, resp)
+    log.info("Placed %d/%d quotes across %d markets",
+             placed, len(pending), len({id(p.qm) for p in pending}))
+
+
+def _stale_exit_slots(qm: QuotedMarket, mid: float, now: float) -> list[str]:
+    """Exit slots to cancel because the target exit price moved >= 1 tick."""
+    if not (qm.yes_exit_order_id or qm.no_exit_order_id):
+        return []
+    market = qm.market
+    # Cheap check first: before the next escalation step, only a stop-loss moves the target
+    sgn = 1.0 if qm.yes_exit_order_id else -1.0
+    if now < qm.exit_recheck_at and not _stop_loss_hit(qm.entry_mid, mid, sgn):
+        return []
+    if qm.yes_exit_order_id:
+        new_exit = compute_exit_price(
+            market, mid, qm.inventory_since, qm.entry_mid,
+            qm.entry_bid_price, "YES", now)
+    else:
+        new_exit = compute_exit_price(
+            market, mid, qm.inventory_since, qm.entry_mid,
+            qm.entry_ask_price, "NO", now)
+
+    tpu = market.ticks_per_unit
+    price_changed = price_to_ticks(new_exit, tpu) != price_to_ticks(qm.exit_price_placed, tpu)
+    # Unchanged exits would log every poll; only a moving target is INFO
+    level = logging.INFO if price_changed else logging.DEBUG
+    if log.isEnabledFor(level):
+        log.log(level, "%s EXIT | placed: $%.3f | target: $%.3f | %.0fs elapsed",
+                market.ticker, qm.exit_price_placed, new_exit, now - qm.inventory_since)
+    if not price_changed:
+        return []
+    log.info("%s refreshing exits (price moved >= 1 tick)", market.ticker)
+    return [slot for slot in ("yes_exit_order_id", "no_exit_order_id") if getattr(qm, slot)]
+
+
+def _is_balance_error(e: Exception) -> bool:
+    """True if the CLOB rejected an order for balance/allowance (the shares are already gone).
+    Reads PolyApiException.error_msg directly instead of formatting the whole exception."""
+    if isinstance(e, PolyApiException):
+        msg = e.error_msg
+        if isinstance(msg, dict):
+            msg = msg.get("error") or msg
+        msg = str(msg)
+    else:
+        msg = str(e)
+    return "not enough balance" in msg or "allowance" in msg
 
 
 def _manage_exits(
@@ -358,104 +769,84 @@ def _manage_exits(
     yes_bal: float,
     no_bal: float,
     mid: float,
+    now: float,
 ) -> None:
-    """Place or refresh exit orders for held inventory."""
+    """Place exit orders for held inventory (stale ones were cancelled by the caller)."""
     market = qm.market
-    elapsed = time.time() - qm.inventory_since
-
-    # --- Check if existing exit orders need price refresh ---
-    if qm.yes_exit_order_id or qm.no_exit_order_id:
-        if qm.yes_exit_order_id:
-            new_exit = compute_exit_price(
-                market, mid, qm.inventory_since, qm.entry_mid,
-                qm.entry_bid_price, "YES")
-        else:
-            new_exit = compute_exit_price(
-                market, mid, qm.inventory_since, qm.entry_mid,
-                qm.entry_ask_price, "NO")
-
-        price_changed = abs(new_exit - qm.exit_price_placed) >= float(market.tick_size)
-        log.info("%s EXIT | placed: $%.3f | target: $%.3f | %.0fs elapsed",
-                 market.ticker, qm.exit_price_placed, new_exit, elapsed)
-
-        if price_changed:
-            exit_ids = [oid for oid in (qm.yes_exit_order_id, qm.no_exit_order_id) if oid]
-            log.info("%s refreshing exits (price moved >= 1 tick)", market.ticker)
-            try:
-                client.cancel_orders(exit_ids)
-                qm.yes_exit_order_id = None
-                qm.no_exit_order_id = None
-            except Exception as e:
-                log.error("%s cancel exits failed: %s", market.ticker, e)
-
-    # --- Place YES exit ---
-    if yes_bal >= config.INVENTORY_MIN_SHARES and qm.yes_exit_order_id is None:
-        shares = math.floor(yes_bal * 100) / 100
+    elapsed = now - qm.inventory_since
+
+    # --- Place exits: (slot, token, balance, entry price, side) per leg ---
+    # Legs may run concurrently, so each only fills its own order slot and reports
+    # back; the shared exit state on qm is written once, on this thread, below.
+    def place_exit(slot: str, token_id: str, bal: float, entry_price: float,
+                   side: str) -> tuple[str, float | None, bool]:
+        """(side, exit price if placed, whether to back off for the cooldown)."""
+        # Floor to whole cents in integer micro-shares (the on-chain unit): no float
+        # floor error (0.29 * 100 == 28.999...), and never negative
+        shares = (max(0, round(bal * MICRO)) // 10_000) / 100
         exit_price = compute_exit_price(
-            market, mid, qm.inventory_since, qm.entry_mid,
-            qm.entry_bid_price, "YES")
-        log.info("EXIT %s SELL YES %.2f @ $%.3f (entry $%.3f, %.0fs elapsed)",
-                 market.ticker, shares, exit_price, qm.entry_bid_price, elapsed)
+            market, mid, qm.inventory_since, qm.entry_mid, entry_price, side, now)
+        log.info("EXIT %s SELL %s %.2f @ $%.3f (entry $%.3f, %.0fs elapsed)",
+                 market.ticker, side, shares, exit_price, entry_price, elapsed)
         try:
-            order = client.create_order(
-                OrderArgs(token_id=market.yes_token_id, price=exit_price,
-                          size=shares, side=SIDE_SELL)
-            )
-            resp = client.post_order(order, orderType=OrderType.GTC)
-            qm.yes_exit_order_id = resp.get("orderID") or resp.get("id")
-            qm.exit_price_placed = exit_price
-        except Exception as e:
-            if "not enough balance" in str(e) or "allowance" in str(e):
-                log.info("EXIT %s YES already sold, cooldown 5s", market.ticker)
-                qm.exit_cooldown_until = time.time() + 5.0
-            else:
-                log.error("EXIT %s SELL YES failed: %s", market.ticker, e)
+            _place_one(client, qm, slot, token_id, exit_price, shares, SIDE_SELL)
+            return side, exit_price, False
+        except _ORDER_ERRORS as e:
+            if _is_balance_error(e):
+                log.info("EXIT %s %s already sold, cooldown 5s", market.ticker, side)
+                return side, None, True
+            log.error("EXIT %s SELL %s failed: %s", market.ticker, side, e)
+            return side, None, False
+
+    specs = [spec for spec in (
+        ("yes_exit_order_id", market.yes_token_id, yes_bal, qm.entry_bid_price, "YES"),
+        ("no_exit_order_id", market.no_token_id, no_bal, qm.entry_ask_price, "NO"),
+    ) if spec[2] >= config.INVENTORY_MIN_SHARES and getattr(qm, spec[0]) is None]
+    # Both sides at once: sign+post latency is max(YES, NO), not the sum
+    if len(specs) == 2:
+        results = [future.result() for future in
+                   [_POOL.submit(place_exit, *spec) for spec in specs]]
+    elif specs:
+        results = [place_exit(*specs[0])]
+    else:
+        return
 
-    # --- Place NO exit ---
-    if no_bal >= config.INVENTORY_MIN_SHARES and qm.no_exit_order_id is None:
-        shares = math.floor(no_bal * 100) / 100
-        exit_price = compute_exit_price(
-            market, mid, qm.inventory_since, qm.entry_mid,
-            qm.entry_ask_price, "NO")
-        log.info("EXIT %s SELL NO %.2f @ $%.3f (entry ask $%.3f, %.0fs elapsed)",
-                 market.ticker, shares, exit_price, qm.entry_ask_price, elapsed)
-        try:
-            order = client.create_order(
-                OrderArgs(token_id=market.no_token_id, price=exit_price,
-                          size=shares, side=SIDE_SELL)
-            )
-            resp = client.post_order(order, orderType=OrderType.GTC)
-            qm.no_exit_order_id = resp.get("orderID") or resp.get("id")
+    if any(cooldown for _, _, cooldown in results):
+        qm.exit_cooldown_until = now + 5.0
+    # exit_price_placed belongs to the exit _stale_exit_slots tracks (YES while it's live)
+    tracked = "YES" if qm.yes_exit_order_id else "NO"
+    for side, exit_price, _ in results:
+        if side == tracked and exit_price is not None:
             qm.exit_price_placed = exit_price
-        except Exception as e:
-            if "not enough balance" in str(e) or "allowance" in str(e):
-                log.info("EXIT %s NO already sold, cooldown 5s", market.ticker)
-                qm.exit_cooldown_until = time.time() + 5.0
-            else:
-                log.error("EXIT %s SELL NO failed: %s", market.ticker, e)
+            # A stopped-out exit follows mid, so it is rechecked every cycle
+            qm.exit_recheck_at = 0.0 if _stop_loss_hit(
+                qm.entry_mid, mid, 1.0 if side == "YES" else -1.0
+            ) else _exit_stable_until(market, qm.inventory_since, now)
 
 
 def should_refresh(quoted: QuotedMarket, mid: float, label: str = "",
                    threshold: float | None = None) -> bool:
     """Check if midpoint has drifted beyond threshold (using pre-fetched mid)."""
+    if mid == quoted.mid_at_placement:
+        return False  # steady state: nothing moved, nothing to compute or log
     thr = threshold if threshold is not None else config.REFRESH_THRESHOLD_PCT
     drift_pct = abs(mid - quoted.mid_at_placement) / quoted.mid_at_placement
-    log.info("%s %s| open: %.4f | now: %.4f | drift: %.1f%%",
-             quoted.market.ticker, label, quoted.mid_at_placement, mid, drift_pct * 100)
+    # Routine drift lines are DEBUG; only drift approaching the threshold is INFO
+    level = logging.INFO if drift_pct > thr * 0.5 else logging.DEBUG
+    if log.isEnabledFor(level):
+        log.log(level, "%s %s| open: %.4f | now: %.4f | drift: %.1f%%",
+                quoted.market.ticker, label, quoted.mid_at_placement, mid, drift_pct * 100)
     return drift_pct > thr
 
 
 def cancel_quoted(client: ClobClient, quoted: QuotedMarket) -> None:
     """Cancel all orders (quotes + exits) for a quoted market."""
-    order_ids = [oid for oid in (
-        quoted.bid_order_id, quoted.ask_order_id,
-        quoted.yes_exit_order_id, quoted.no_exit_order_id,
-    ) if oid]
+    order_ids = quoted.order_ids()
     if not order_ids:
         return
 
     try:
-        client.cancel_orders(order_ids)
+        _cancel_orders(client, order_ids)
         parts = []
         if quoted.bid_order_id or quoted.ask_order_id:
             parts.append("quotes")
@@ -464,39 +855,36 @@ def cancel_quoted(client: ClobClient, quoted: QuotedMarket) -> None:
         if quoted.no_exit_order_id:
             parts.append("NO exit")
         log.info("%s cancelled %d orders (%s)", quoted.market.ticker, len(order_ids), " + ".join(parts))
-        quoted.bid_order_id = None
-        quoted.ask_order_id = None
-        quoted.yes_exit_order_id = None
-        quoted.no_exit_order_id = None
-    except Exception as e:
+        quoted.reset()
+    except _ORDER_ERRORS as e:
         log.error("%s cancel failed: %s", quoted.market.ticker, e)
 
 
-
 def cancel_all_quoted(client: ClobClient, quoted_markets: list[QuotedMarket]) -> None:
     """Cancel all orders (quotes + exits) across all managed markets."""
-    all_ids = []
+    all_ids = [oid for qm in quoted_markets for oid in qm.order_ids()]
+    unrecorded = any(qm.resync for qm in quoted_markets)
     for qm in quoted_markets:
-        for oid in (qm.bid_order_id, qm.ask_order_id,
-                    qm.yes_exit_order_id, qm.no_exit_order_id):
-            if oid:
-                all_ids.append(oid)
-        qm.bid_order_id = None
-        qm.ask_order_id = None
-        qm.yes_exit_order_id = None
-        qm.no_exit_order_id = None
-
-    if not all_ids:
+        qm.reset()
+        qm.resync = False
+
+    if not all_ids and not unrecorded:
         log.info("No orders to cancel")
         return
 
-    try:
-        client.cancel_orders(all_ids)
-        log.info("Cancelled %d orders across all markets", len(all_ids))
-    except Exception as e:
-        log.error("Bulk cancel failed: %s, trying cancel_all", e)
+    if unrecorded:
+        # Cancelling by ID would miss orders whose IDs were never recorded
+        log.warning("Some orders have no recorded IDs, using cancel_all")
+    else:
         try:
-            client.cancel_all()
-            log.info("cancel_all succeeded")
-        except Exception as e2:
-            log.error("cancel_all also failed: %s", e2)
+            _cancel_orders(client, all_ids)
+            log.info("Cancelled %d orders across all markets", len(all_ids))
+            return
+        except _ORDER_ERRORS as e:
+            log.error("Bulk cancel failed: %s, trying cancel_all", e)
+    try:
+        _CANCEL_POOL.submit(_retry_throttled, client.cancel_all).result(
+            timeout=CANCEL_TIMEOUT_SECONDS)
+        log.info("cancel_all succeeded")
+    except _ORDER_ERRORS as e2:
+        log.error("cancel_all failed: %s", e2)
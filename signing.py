@@ -0,0 +1,74 @@
+"""
+Order signing in worker processes. EIP-712 signing is pure-Python CPU work
+(~5 ms per order) that holds the GIL, so the quoting threads' network I/O
+stalls behind it; a small process pool signs orders in parallel instead.
+
+Per-token market parameters (tick size, neg-risk, fee rate) are still resolved
+through the main-process ClobClient, whose caches make that a dict lookup.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import CreateOrderOptions, OrderArgs
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.signer import Signer
+from py_clob_client.utilities import price_valid
+
+import config
+
+log = logging.getLogger(__name__)
+
+_POOL: ProcessPoolExecutor | None = None
+_builder: OrderBuilder | None = None  # set inside each worker process
+
+
+def _init_worker(private_key: str, chain_id: int, sig_type: int, funder: str) -> None:
+    global _builder
+    _builder = OrderBuilder(Signer(private_key, chain_id), sig_type=sig_type, funder=funder)
+
+
+def _sign(args: OrderArgs, tick_size: str, neg_risk: bool):
+    return _builder.create_order(args, CreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk))
+
+
+def start(client: ClobClient, workers: int) -> None:
+    """Spawn `workers` signing processes for `client`'s key (0 keeps signing in-process).
+    Capped at cpu_count - 1: without a spare core, extra processes only add IPC."""
+    global _POOL
+    workers = min(workers, (os.cpu_count() or 1) - 1)
+    if workers <= 0 or _POOL is not None:
+        return
+    # spawn, not fork: the parent already runs I/O and WebSocket threads
+    _POOL = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config.PRIVATE_KEY, config.CHAIN_ID,
+                  client.builder.sig_type, client.builder.funder),
+    )
+    atexit.register(_POOL.shutdown, wait=False, cancel_futures=True)
+    log.info("Signing orders in %d worker processes", workers)
+
+
+def sign_order(client: ClobClient, args: OrderArgs) -> Future:
+    """Sign `args` like client.create_order, returning a Future of the signed order.
+    An off-tick price fails with ValueError (create_order itself raises a bare Exception)."""
+    try:
+        tick_size = client.get_tick_size(args.token_id)
+        if not price_valid(args.price, tick_size):
+            raise ValueError(f"price ({args.price}), min: {tick_size} - max: {1 - float(tick_size)}")
+        if _POOL is None:
+            future = Future()
+            future.set_result(client.create_order(args))
+            return future
+        neg_risk = client.get_neg_risk(args.token_id)
+        args.fee_rate_bps = client.get_fee_rate_bps(args.token_id)
+    except Exception as e:
+        future = Future()
+        future.set_exception(e)
+        return future
+    return _POOL.submit(_sign, args, tick_size, neg_risk)
@@ -0,0 +1,36 @@
+import inventory
+from discovery import Market
+
+
+class FakeClient:
+    creds = None
+
+    def get_address(self) -> str:
+        return "0xabc"
+
+
+def test_main_polls_every_market_token(monkeypatch):
+    markets = [
+        Market("AAPL", "q", "c1", "1", "2", 0.055, 50, "0.01"),
+        Market("MSFT", "q", "c2", "3", "4", 0.055, 50, "0.01"),
+    ]
+    polled = []
+
+    def fake_check_and_dump(client, targets, fresh=False):
+        polled.append((targets, fresh))
+        inventory._stop.set()
+
+    monkeypatch.setattr(inventory, "build_client", FakeClient)
+    monkeypatch.setattr(inventory, "discover_markets", lambda: markets)
+    monkeypatch.setattr(inventory.UserFeed, "available", staticmethod(lambda: False))
+    monkeypatch.setattr(inventory.config, "INVENTORY_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(inventory, "check_and_dump", fake_check_and_dump)
+    monkeypatch.setattr(inventory.signal, "signal", lambda *a: None)
+    inventory._stop.clear()
+    try:
+        inventory.main()
+    finally:
+        inventory._stop.clear()
+
+    assert polled == [([("AAPL/YES", "1"), ("AAPL/NO", "2"),
+                        ("MSFT/YES", "3"), ("MSFT/NO", "4")], False)]
@@ -0,0 +1,34 @@
+import time
+
+from py_clob_client.clob_types import ApiCreds
+
+import config
+import positions
+from discovery import Market
+from positions import PositionTracker
+from user_feed import STALE_SECONDS
+
+
+class NullSocket:
+    def send(self, data) -> None:
+        pass
+
+
+def test_cache_distrusted_while_user_feed_down(monkeypatch):
+    monkeypatch.setattr(positions.UserFeed, "available", staticmethod(lambda: True))
+    tracker = PositionTracker(ApiCreds("k", "s", "p"),
+                              [Market("AAPL", "q", "c1", "1", "2", 0.055, 50, "0.01")])
+    feed = tracker._feed
+    later = time.time() + config.POSITION_DIRTY_SECONDS + 1
+    tracker.update("1", 10.0, later)
+    assert tracker.cached("1", later) is None  # never connected
+
+    feed._handle_open(NullSocket())
+    try:
+        assert tracker.cached("1", time.time()) is None  # (re)connect dirties every token
+        assert tracker.cached("1", later) == 10.0
+
+        feed._last_msg = time.monotonic() - STALE_SECONDS - 1
+        assert tracker.cached("1", later) is None  # silent socket
+    finally:
+        feed.stop()
@@ -0,0 +1,43 @@
+import httpx
+from py_clob_client.exceptions import PolyApiException
+
+from discovery import Market
+from quoting import QuotedMarket, apply_cycle_plans, plan_market_cycle
+
+
+class FakeClient:
+    def __init__(self):
+        self.post_error: PolyApiException | None = None
+        self.market_cancels: list[str] = []
+
+    def get_tick_size(self, token_id: str) -> str:
+        return "0.01"
+
+    def create_order(self, args):
+        return args
+
+    def post_orders(self, args):
+        if self.post_error is not None:
+            raise self.post_error
+        return [{"orderID": f"o{i}"} for i in range(len(args))]
+
+    def cancel_orders(self, order_ids):
+        pass
+
+    def cancel_market_orders(self, market="", asset_id=""):
+        self.market_cancels.append(market)
+
+
+def test_post_orders_500_resyncs_market_next_cycle():
+    client = FakeClient()
+    qm = QuotedMarket(Market("AAPL", "q", "c1", "1", "2", 0.055, 50, "0.01"))
+    client.post_error = PolyApiException(httpx.Response(500, json={"error": "boom"}))
+
+    apply_cycle_plans(client, [plan_market_cycle(client, qm, 0.0, 0.0, 0.5, 0.0)])
+    assert qm.resync
+    assert client.market_cancels == []
+
+    client.post_error = None
+    apply_cycle_plans(client, [plan_market_cycle(client, qm, 0.0, 0.0, 0.5, 1.0)])
+    assert client.market_cancels == ["c1"]
+    assert not qm.resync
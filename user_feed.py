@@ -0,0 +1,114 @@
+"""
+User-channel WebSocket feed — pushes our own trade events so the inventory
+dumper can react to fills instead of polling balances on a timer.
+
+Requires `websocket-client`; callers should check UserFeed.available() and
+fall back to polling when it isn't installed.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Callable
+
+from py_clob_client.clob_types import ApiCreds
+
+from http_session import json_loads
+
+try:
+    import websocket  # websocket-client
+except ImportError:
+    websocket = None
+
+log = logging.getLogger(__name__)
+
+WS_USER_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
+PING_INTERVAL_SECONDS = 10.0
+RECONNECT_DELAY_SECONDS = 2.0
+STALE_SECONDS = 15.0  # fills are trusted to arrive only while the socket has spoken this recently
+
+
+class UserFeed:
+    """Background thread calling `on_trade(condition_id)` for every trade event on our markets,
+    and `on_connect()` after each (re)subscribe, since fills may have been missed while down."""
+
+    def __init__(self, creds: ApiCreds, condition_ids: list[str],
+                 on_trade: Callable[[str], None],
+                 on_connect: Callable[[], None] | None = None):
+        self._creds = creds
+        self._condition_ids = list(condition_ids)
+        self._on_trade = on_trade
+        self._on_connect = on_connect
+        self._connected = False
+        self._last_msg = 0.0  # monotonic time of the last frame (incl. PONG)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._ws = None
+
+    @staticmethod
+    def available() -> bool:
+        return websocket is not None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="user-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def live(self) -> bool:
+        """True while the socket is subscribed and has spoken within STALE_SECONDS."""
+        return self._connected and time.monotonic() - self._last_msg <= STALE_SECONDS
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                WS_USER_URL,
+                on_open=self._handle_open,
+                on_message=self._handle_message,
+                on_error=lambda ws, e: log.warning("User feed error: %s", e),
+            )
+            self._ws.run_forever()
+            self._connected = False
+            if not self._stop.is_set():
+                log.warning("User feed disconnected, reconnecting in %.0fs", RECONNECT_DELAY_SECONDS)
+                self._stop.wait(RECONNECT_DELAY_SECONDS)
+
+    def _handle_open(self, ws) -> None:
+        ws.send(json.dumps({
+            "auth": {
+                "apiKey": self._creds.api_key,
+                "secret": self._creds.api_secret,
+                "passphrase": self._creds.api_passphrase,
+            },
+            "markets": self._condition_ids,
+            "type": "user",
+        }))
+        log.info("User feed subscribed to %d markets", len(self._condition_ids))
+        self._last_msg = time.monotonic()
+        self._connected = True
+        if self._on_connect is not None:
+            self._on_connect()
+        threading.Thread(target=self._ping, args=(ws,), name="user-feed-ping", daemon=True).start()
+
+    def _ping(self, ws) -> None:
+        # Server drops idle sockets; app-level "PING" keeps the session alive
+        while not self._stop.wait(PING_INTERVAL_SECONDS):
+            try:
+                ws.send("PING")
+            except Exception:
+                return
+
+    def _handle_message(self, ws, message: str) -> None:
+        self._last_msg = time.monotonic()
+        if message == "PONG":
+            return
+        try:
+            data = json_loads(message)
+        except ValueError:
+            return
+        for event in data if isinstance(data, list) else [data]:
+            if event.get("event_type") == "trade" and event.get("market"):
+                self._on_trade(event["market"])